@@ -1,4 +1,8 @@
 # Python Dictionary Methods Demonstration
+import time
+import tracemalloc
+
+import numpy as np
 
 d = {"a": 1, "b": 2, "c": 3}
 
@@ -46,3 +50,142 @@ print("update:", d)
 # 11. values()
 print("values:", list(d.values()))
 
+
+# 12. Column-oriented record store
+# Millions of small dicts with the same keys waste memory on per-dict hash
+# tables and boxed values. RecordStore keeps one typed NumPy array per field
+# plus a single key -> row index, and exposes a dict-like API on top of it.
+# pop() moves the last row into the freed slot, so iteration order is not
+# insertion order after a pop.
+class RecordStore:
+    def __init__(self, fields, capacity=16):
+        self.fields = dict(fields)                   # field name -> dtype
+        self.columns = {f: np.empty(capacity, dtype=t) for f, t in self.fields.items()}
+        self.index = {}                              # key -> row
+        self.keys_by_row = []
+
+    def __len__(self):
+        return len(self.keys_by_row)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def _grow(self, needed):
+        capacity = len(next(iter(self.columns.values())))
+        if needed > capacity:
+            capacity = max(needed, 2 * capacity)
+            for f, col in self.columns.items():
+                new = np.empty(capacity, dtype=col.dtype)
+                new[:len(self)] = col[:len(self)]
+                self.columns[f] = new
+
+    def __getitem__(self, key):
+        row = self.index[key]
+        return {f: col[row].item() for f, col in self.columns.items()}
+
+    def __setitem__(self, key, record):
+        unknown = record.keys() - self.fields.keys()
+        if unknown:
+            raise KeyError(f"record {key!r} has unknown fields {sorted(unknown)}")
+        row = self.index.get(key)
+        if row is None:
+            missing = self.fields.keys() - record.keys()
+            if missing:
+                raise KeyError(f"new record {key!r} is missing fields {sorted(missing)}")
+        # convert everything first so a bad value leaves the store untouched
+        values = {f: np.asarray(value, dtype=self.fields[f]) for f, value in record.items()}
+        if row is None:
+            row = len(self)
+            self._grow(row + 1)
+            self.index[key] = row
+            self.keys_by_row.append(key)
+        for f, value in values.items():
+            self.columns[f][row] = value
+
+    def get(self, key, default=None):
+        return self[key] if key in self.index else default
+
+    def setdefault(self, key, record):
+        if key not in self.index:
+            self[key] = record
+        return self[key]
+
+    def update(self, other=(), **kwargs):
+        for key, record in dict(other, **kwargs).items():
+            self[key] = record                       # partial records update existing rows
+
+    def pop(self, key, *default):
+        if key not in self.index:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        record = self[key]
+        row, last = self.index.pop(key), len(self) - 1
+        if row != last:                              # move the last row into the hole
+            for col in self.columns.values():
+                col[row] = col[last]
+            moved = self.keys_by_row[last]
+            self.keys_by_row[row] = moved
+            self.index[moved] = row
+        self.keys_by_row.pop()
+        return record
+
+    def popitem(self):
+        if not self.keys_by_row:
+            raise KeyError("popitem(): record store is empty")
+        key = self.keys_by_row[-1]
+        return key, self.pop(key)
+
+    def keys(self):
+        return iter(self.keys_by_row)
+
+    def values(self):
+        return (self[key] for key in self.keys_by_row)
+
+    def items(self):
+        return ((key, self[key]) for key in self.keys_by_row)
+
+    @classmethod
+    def fromkeys(cls, keys, record, fields):
+        keys = list(dict.fromkeys(keys))             # repeated keys share one row, as in dict.fromkeys
+        store = cls(fields, capacity=max(len(keys), 16))
+        store.index = dict(zip(keys, range(len(keys))))
+        store.keys_by_row = list(store.index)
+        for f in store.fields:
+            store.columns[f][:len(store)] = record[f]   # one vectorized fill per field
+        return store
+
+    def column(self, field):
+        return self.columns[field][:len(self)]       # view, no copy
+
+    def bulk_update(self, keys, **values):
+        rows = np.fromiter((self.index[k] for k in keys), dtype=np.intp, count=len(keys))
+        for f, vals in values.items():
+            self.columns[f][rows] = vals
+
+store = RecordStore.fromkeys(["x", "y", "z"], {"age": 0, "score": 0.0}, {"age": "i4", "score": "f8"})
+store.update({"x": {"age": 20}, "w": {"age": 31, "score": 88.5}})
+store.setdefault("v", {"age": 40, "score": 1.0})
+print("RecordStore get('x'):", store.get("x"))
+print("RecordStore pop('y'):", store.pop("y"))
+print("RecordStore popitem:", store.popitem())
+store.bulk_update(["x", "z"], score=[90.0, 75.5])
+print("RecordStore items:", list(store.items()))
+
+# Memory and throughput against plain dicts (raise n towards 50M on a big machine)
+n = 200_000
+tracemalloc.start()
+start = time.perf_counter()
+plain = {i: {"age": 20, "score": 0.0} for i in range(n)}
+dict_time = time.perf_counter() - start
+dict_mem = tracemalloc.get_traced_memory()[0]
+del plain
+tracemalloc.reset_peak()
+base = tracemalloc.get_traced_memory()[0]
+start = time.perf_counter()
+store = RecordStore.fromkeys(range(n), {"age": 20, "score": 0.0}, {"age": "i4", "score": "f8"})
+store_time = time.perf_counter() - start
+store_mem = tracemalloc.get_traced_memory()[0] - base
+tracemalloc.stop()
+print(f"dicts:       {dict_mem / n:.0f} bytes/entry, built in {dict_time:.2f}s")
+print(f"RecordStore: {store_mem / n:.0f} bytes/entry, built in {store_time:.2f}s")
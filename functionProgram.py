@@ -1,6 +1,18 @@
 import datetime
 import random
 import math
+import functools
+import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 def Hello():
     print("Hello")
@@ -36,3 +48,222 @@ print(abs(-12))
 print(math.floor(12.2))
 print(math.ceil(12.2))
 print(math.sqrt(36))
+
+# Memoization with LRU/LFU eviction, TTL and hit/miss/eviction counters
+# memoize() caches results of pure functions by their arguments. Stores:
+#   LRUStore  - evicts the least recently used entry
+#   LFUStore  - evicts the least frequently used entry (O(1) frequency buckets)
+#   DiskStore - SQLite file shared by every process that opens the same path
+# With elementwise=True a NumPy array argument skips the per-element cache:
+# the function runs once on the unique values and the result is scattered back.
+class LRUStore:
+    def __init__(self, maxsize):
+        self.maxsize, self.data = maxsize, OrderedDict()
+
+    def get(self, key):
+        if key in self.data:
+            self.data.move_to_end(key)
+            return self.data[key]
+
+    def set(self, key, entry):
+        self.data[key] = entry
+        self.data.move_to_end(key)
+        evicted = 0
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def clear(self):
+        self.data.clear()
+
+class LFUStore:
+    def __init__(self, maxsize):
+        self.maxsize, self.data, self.freq = maxsize, {}, {}
+        self.buckets = defaultdict(OrderedDict)           # use count -> keys, oldest first
+        self.min_freq = 0
+
+    def _touch(self, key):
+        f = self.freq[key]
+        del self.buckets[f][key]
+        if not self.buckets[f]:
+            del self.buckets[f]
+            if self.min_freq == f:
+                self.min_freq = f + 1
+        self.freq[key] = f + 1
+        self.buckets[f + 1][key] = None
+
+    def get(self, key):
+        if key in self.data:
+            self._touch(key)
+            return self.data[key]
+
+    def set(self, key, entry):
+        if key in self.data:
+            self.data[key] = entry
+            self._touch(key)
+            return 0
+        if self.maxsize <= 0:                             # nothing is kept, as with LRUStore
+            return 1
+        evicted = 0
+        if len(self.data) >= self.maxsize:
+            if self.min_freq not in self.buckets:         # stale after a delete()
+                self.min_freq = min(self.buckets)
+            old, _ = self.buckets[self.min_freq].popitem(last=False)
+            if not self.buckets[self.min_freq]:
+                del self.buckets[self.min_freq]
+            del self.data[old], self.freq[old]
+            evicted = 1
+        self.data[key], self.freq[key], self.min_freq = entry, 1, 1
+        self.buckets[1][key] = None
+        return evicted
+
+    def delete(self, key):
+        if key in self.data:
+            f = self.freq.pop(key)
+            del self.data[key], self.buckets[f][key]
+            if not self.buckets[f]:
+                del self.buckets[f]
+
+    def clear(self):
+        self.__init__(self.maxsize)
+
+class DiskStore:
+    def __init__(self, path, maxsize=100_000):
+        self.path, self.maxsize = path, maxsize
+        self._conn, self._pid = None, None
+
+    def _db(self):
+        if self._pid != os.getpid():                      # one connection per process
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, entry BLOB, used REAL)")
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key):
+        k = pickle.dumps(key)
+        with self._db() as db:
+            row = db.execute("SELECT entry FROM cache WHERE key = ?", (k,)).fetchone()
+            if row:
+                db.execute("UPDATE cache SET used = ? WHERE key = ?", (time.time(), k))
+                return pickle.loads(row[0])
+
+    def set(self, key, entry):
+        with self._db() as db:
+            db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                       (pickle.dumps(key), pickle.dumps(entry), time.time()))
+            extra = db.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.maxsize
+            if extra > 0:
+                db.execute("DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY used LIMIT ?)", (extra,))
+            return max(extra, 0)
+
+    def delete(self, key):
+        with self._db() as db:
+            db.execute("DELETE FROM cache WHERE key = ?", (pickle.dumps(key),))
+
+    def clear(self):
+        with self._db() as db:
+            db.execute("DELETE FROM cache")
+
+def memoize(maxsize=1024, policy="lru", ttl=None, store=None, elementwise=False):
+    def decorator(func):
+        cache = store if store is not None else {"lru": LRUStore, "lfu": LFUStore}[policy](maxsize)
+        stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+        lock = threading.Lock()
+        name = f"{func.__module__}.{func.__qualname__}"     # keeps shared DiskStore entries apart
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if elementwise and args and isinstance(args[0], np.ndarray):
+                uniq, inverse = np.unique(args[0], return_inverse=True)
+                return np.asarray(func(uniq, *args[1:], **kwargs))[inverse].reshape(args[0].shape)
+            key = (name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return func(*args, **kwargs)              # unhashable arguments are not cached
+            with lock:
+                entry = cache.get(key)
+                if entry is not None:
+                    value, expires = entry
+                    if expires is None or expires > time.time():
+                        stats["hits"] += 1
+                        return value
+                    cache.delete(key)
+                    stats["expired"] += 1
+                stats["misses"] += 1
+            value = func(*args, **kwargs)                 # computed outside the lock
+            with lock:
+                stats["evictions"] += cache.set(key, (value, time.time() + ttl if ttl else None))
+            return value
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+                stats.update(dict.fromkeys(stats, 0))
+
+        wrapper.cache_stats = lambda: dict(stats)
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+cached_mul = memoize(maxsize=2)(mul)
+for x in [1, 2, 1, 3, 1, 2]:
+    cached_mul(x, 5)
+print("LRU stats:", cached_mul.cache_stats())
+cached_sqrt = memoize(maxsize=2, policy="lfu", ttl=60)(math.sqrt)
+for x in [36, 36, 49, 64, 36]:
+    cached_sqrt(x)
+print("LFU stats:", cached_sqrt.cache_stats())
+batched_a = memoize(elementwise=True)(a)
+print("Batched lambda:", batched_a(np.array([4, 4, 2, 4])))
+cache_path = os.path.join(tempfile.mkdtemp(), "functionProgram_cache.sqlite")
+shared_pow = memoize(store=DiskStore(cache_path))(pow)   # shared by all worker processes
+shared_mul = memoize(store=DiskStore(cache_path))(mul)   # same file, separate entries
+print("Disk cached pow:", shared_pow(2, 3), shared_pow(2, 3), shared_pow.cache_stats())
+print("Disk cached mul:", shared_mul(2, 3), shared_mul.cache_stats())
+shutil.rmtree(os.path.dirname(cache_path))
+
+# Bulk reproducible random numbers instead of one random.randint()/choice() per call
+# The output is cut into fixed-size blocks and block i always draws from the
+# i-th stream spawned from the root seed (np.random.SeedSequence). Because
+# the blocks don't depend on how many workers fill them, the result is
+# bit-identical for any worker count. NumPy releases the GIL while filling,
+# so a thread pool scales across cores.
+def worker_streams(seed, n):
+    # n independent generators, e.g. one per Monte Carlo worker process
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n)]
+
+def _fill(out, draw, seed, workers, block):
+    n_blocks = -(-len(out) // block)
+    streams = np.random.SeedSequence(seed).spawn(n_blocks)
+
+    def fill_block(i):
+        part = out[i * block:(i + 1) * block]
+        part[...] = draw(np.random.default_rng(streams[i]), len(part))
+
+    if workers:
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(fill_block, range(n_blocks)))
+    else:
+        for i in range(n_blocks):
+            fill_block(i)
+    return out
+
+def bulk_randint(low, high, size, seed=0, workers=None, block=1 << 20):
+    # like random.randint, high is inclusive
+    out = np.empty(size, dtype=np.int64)
+    return _fill(out, lambda rng, n: rng.integers(low, high, n, endpoint=True), seed, workers, block)
+
+def bulk_choice(options, size, seed=0, workers=None, block=1 << 20):
+    options = np.asarray(options)
+    return options[bulk_randint(0, len(options) - 1, size, seed, workers, block)]
+
+print(bulk_randint(1, 10, 10, seed=42))
+print(bulk_choice(l, 5, seed=42))
+one = bulk_randint(1, 10, 10_000_000, seed=7)
+many = bulk_randint(1, 10, 10_000_000, seed=7, workers=4)
+print("identical for 1 and 4 workers:", np.array_equal(one, many))
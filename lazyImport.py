@@ -0,0 +1,63 @@
+# Lazy imports for short-lived scripts
+# lazy_import() returns a stand-in module right away; the real import runs
+# the first time one of its attributes is used. Nothing is imported up front,
+# not even the parent package, so `plt = lazy_import("matplotlib.pyplot")`
+# costs nothing until the first plt.* call. Jobs that never touch e.g.
+# matplotlib.animation or matplotlib.widgets never pay for them.
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    def _load(self):
+        module = self.__dict__.get("_module")
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            # copy the module's names onto the stand-in and drop the __getattr__
+            # hook, so later lookups cost the same as on the real module
+            self.__dict__.update(module.__dict__)
+            self.__dict__["_module"] = module
+            object.__setattr__(self, "__class__", LoadedModule)   # not forwarded to the module
+        return module
+
+    def __getattr__(self, attr):
+        # only reached for names not set on the stand-in itself
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if "_module" in self.__dict__ else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+class LoadedModule(types.ModuleType):
+    # what a LazyModule turns into once imported; writes still reach the real module
+    def __setattr__(self, attr, value):
+        setattr(self._module, attr, value)
+        self.__dict__[attr] = value
+
+    def __repr__(self):
+        return f"<lazy module {self.__name__!r} (loaded)>"
+
+
+def lazy_import(name):
+    if name in sys.modules:
+        return sys.modules[name]
+    # checking that the top-level package exists does not import anything
+    if importlib.util.find_spec(name.partition(".")[0]) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return LazyModule(name)
+
+
+if __name__ == "__main__":
+    animation = lazy_import("matplotlib.animation")
+    print("loaded before use:", "matplotlib" in sys.modules)   # False
+    print(animation.FuncAnimation)                             # real import happens here
+    print("loaded after use:", "matplotlib" in sys.modules)    # True
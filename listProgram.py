@@ -1,4 +1,7 @@
 # Python Tuple Methods Demonstration
+import sys
+from array import array
+from bisect import bisect_left
 
 tup = (1, 2, 3, 2, 4, 2, 5)
 
@@ -9,3 +12,53 @@ print("count(2):", tup.count(2))
 print("index(3):", tup.index(3))
 print("index of 2 from position 2:", tup.index(2, 2))
 
+
+# Indexed immutable sequence for repeated count()/index() queries
+# Positions of every value are collected once into sorted array('q') lists
+# (8 bytes per position). count() is then O(1) and index(value, start, stop)
+# is a bisect, O(log n), instead of a linear scan per query.
+class IndexedSequence:
+    def __init__(self, items):
+        self.items = tuple(items)
+        self.positions = {}
+        for i, item in enumerate(self.items):
+            self.positions.setdefault(item, array("q")).append(i)   # appended in order, so sorted
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, i):
+        return self.items[i]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def count(self, value):
+        return len(self.positions.get(value, ()))
+
+    def index(self, value, start=0, stop=sys.maxsize):
+        start, stop, _ = slice(start, stop).indices(len(self.items))
+        pos = self.positions.get(value, ())
+        i = bisect_left(pos, start)
+        if i == len(pos) or pos[i] >= stop:
+            raise ValueError(f"{value!r} is not in sequence")
+        return pos[i]
+
+    def count_many(self, values):
+        return [self.count(v) for v in values]
+
+    def index_many(self, values, start=0, stop=sys.maxsize, default=-1):
+        out = []
+        for v in values:
+            try:
+                out.append(self.index(v, start, stop))
+            except ValueError:
+                out.append(default)
+        return out
+
+itup = IndexedSequence(tup)
+print("indexed count(2):", itup.count(2))
+print("indexed index(3):", itup.index(3))
+print("indexed index of 2 from position 2:", itup.index(2, 2))
+print("batched count [2, 5, 9]:", itup.count_many([2, 5, 9]))
+print("batched index [2, 5, 9]:", itup.index_many([2, 5, 9]))
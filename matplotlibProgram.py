@@ -1,18 +1,30 @@
 # -------------------------------------------
 # Imports (core and optional modules for plotting)
 # -------------------------------------------
+import atexit
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib as mpl
 import matplotlib.pyplot as plt        # state-machine (MATLAB-like) API
 from matplotlib.figure import Figure   # object-oriented Figure
+from matplotlib.artist import Artist   # base class for custom artists
 from matplotlib.axes import Axes       # object-oriented Axes (rarely imported directly)
-from mpl_toolkits.mplot3d import Axes3D  # registers 3D projection
-from matplotlib.ticker import FuncFormatter, MaxNLocator, MultipleLocator
-import matplotlib.gridspec as gridspec
-from matplotlib.cm import ScalarMappable
-from matplotlib.animation import FuncAnimation
-from matplotlib.widgets import Slider, Button, CheckButtons, RadioButtons
-from matplotlib.colors import LogNorm, Normalize
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg  # headless raster canvas
+from matplotlib.font_manager import FontProperties
+from lazyImport import lazy_import    # optional modules load on first use
+mplot3d = lazy_import('mpl_toolkits.mplot3d')      # 3D projection (Axes3D)
+ticker = lazy_import('matplotlib.ticker')          # FuncFormatter, MaxNLocator, MultipleLocator
+gridspec = lazy_import('matplotlib.gridspec')
+cm = lazy_import('matplotlib.cm')                  # ScalarMappable
+animation = lazy_import('matplotlib.animation')    # FuncAnimation
+widgets = lazy_import('matplotlib.widgets')        # Slider, Button, CheckButtons, RadioButtons
+colors = lazy_import('matplotlib.colors')          # LogNorm, Normalize
 
 
 # -------------------------------------------
@@ -116,8 +128,8 @@ ax.set_ylim(-1,1)
 ax.set_xticks([0,2,4,6,8,10])
 ax.set_xticklabels(['a','b','c','d','e','f'], rotation=45, fontsize=10)
 ax.tick_params(axis='x', which='major', labelsize=10, direction='out', length=6)
-ax.xaxis.set_major_locator(MaxNLocator(5))
-ax.xaxis.set_major_formatter(FuncFormatter(lambda val, pos: f"{val:.2f}"))
+ax.xaxis.set_major_locator(ticker.MaxNLocator(5))
+ax.xaxis.set_major_formatter(ticker.FuncFormatter(lambda val, pos: f"{val:.2f}"))
 ax.grid(True, which='major', linestyle='--', alpha=0.7)
 ax.minorticks_on()
 ax.spines['top'].set_visible(False)
@@ -153,7 +165,7 @@ ax.plot(x, y, color='tab:blue')
 ax.plot(x, y, color='#FF00AA')      # hex
 ax.plot(x, y, color=(0.1,0.2,0.5))  # RGB tuple
 plt.cm.get_cmap('viridis')(0.5)
-sm = ScalarMappable(cmap='viridis', norm=mpl.colors.Normalize(vmin=0, vmax=1))
+sm = cm.ScalarMappable(cmap='viridis', norm=mpl.colors.Normalize(vmin=0, vmax=1))
 fig.colorbar(sm, ax=ax)
 
 
@@ -216,7 +228,7 @@ def update(frame):
     line.set_data(x,y)
     return line,
 
-ani = FuncAnimation(fig, update, frames=200, init_func=init, blit=True, interval=20)
+ani = animation.FuncAnimation(fig, update, frames=200, init_func=init, blit=True, interval=20)
 ani.save('sine_wave.mp4', fps=30, dpi=200)
 
 
@@ -238,7 +250,7 @@ fig.canvas.mpl_connect('pick_event', on_pick)
 # -------------------------------------------
 axcolor = 'lightgoldenrodyellow'
 axamp = plt.axes([0.25, 0.1, 0.65, 0.03], facecolor=axcolor)
-samp = Slider(axamp, 'Amp', 0.1, 10.0, valinit=1)
+samp = widgets.Slider(axamp, 'Amp', 0.1, 10.0, valinit=1)
 
 def update(val):
     line.set_ydata(val*np.sin(x))
@@ -250,7 +262,7 @@ samp.on_changed(update)
 # -------------------------------------------
 # LogNorm with color normalization
 # -------------------------------------------
-pcm = ax.pcolormesh(X, Y, Z, norm=LogNorm(vmin=Z.min()+1e-6, vmax=Z.max()), cmap='viridis')
+pcm = ax.pcolormesh(X, Y, Z, norm=colors.LogNorm(vmin=Z.min()+1e-6, vmax=Z.max()), cmap='viridis')
 
 
 # -------------------------------------------
@@ -270,3 +282,450 @@ axs[1].set_title('Histogram')
 fig.tight_layout()
 plt.savefig('example.png', dpi=150)
 plt.show()
+
+
+# -------------------------------------------
+# Parallel animation export (precomputed frames, Agg workers, ffmpeg pipe)
+# -------------------------------------------
+# All frame data is computed up front in one vectorized call. Each worker
+# process builds one Agg figure and reuses it for every frame it renders;
+# the raw RGBA frames are piped to ffmpeg in frame order.
+_frame_state = {}
+
+def _init_frame_worker(x, frames_y, figsize, dpi):
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_xlim(0, 2*np.pi); ax.set_ylim(-1, 1)
+    line, = ax.plot(x, frames_y[0], lw=2)
+    _frame_state.update(fig=fig, line=line, frames_y=frames_y)
+
+def _render_frames(start, stop):
+    fig, line, frames_y = _frame_state['fig'], _frame_state['line'], _frame_state['frames_y']
+    out = []
+    for i in range(start, stop):
+        line.set_ydata(frames_y[i])
+        fig.canvas.draw()
+        out.append(bytes(fig.canvas.buffer_rgba()))
+    return b''.join(out)
+
+def export_animation(path, frames=200, fps=30, dpi=200, figsize=(6.4, 4.8), workers=None, batch=16):
+    x = np.linspace(0, 2*np.pi, 200)                                    # once, not per frame
+    frames_y = np.sin(x[None, :] + 0.1*np.arange(frames)[:, None])      # every frame at once
+    state = (x, frames_y, figsize, dpi)
+    width, height = FigureCanvasAgg(Figure(figsize=figsize, dpi=dpi)).get_width_height()
+    cmd = [mpl.rcParams['animation.ffmpeg_path'], '-y', '-loglevel', 'error',
+           '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+           '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path]
+    batches = [(s, min(s + batch, frames)) for s in range(0, frames, batch)]
+    with subprocess.Popen(cmd, stdin=subprocess.PIPE) as proc:
+        if workers:
+            with ProcessPoolExecutor(workers, initializer=_init_frame_worker, initargs=state) as pool:
+                pending = deque()
+                for b in batches:
+                    pending.append(pool.submit(_render_frames, *b))
+                    if len(pending) >= 2*workers:                   # bound frames held in memory
+                        proc.stdin.write(pending.popleft().result())
+                while pending:
+                    proc.stdin.write(pending.popleft().result())
+        else:
+            _init_frame_worker(*state)
+            for b in batches:
+                proc.stdin.write(_render_frames(*b))
+        proc.stdin.close()
+    if proc.returncode:
+        raise RuntimeError(f"ffmpeg exited with status {proc.returncode}")
+
+export_animation('sine_wave_fast.mp4', frames=200, fps=30, dpi=200)  # workers=N renders in N processes
+
+
+# -------------------------------------------
+# Batch report rendering with pooled figures
+# -------------------------------------------
+# Each process keeps one styled Figure/Axes per template. Between specs only
+# the data artists are removed, and tight_layout only runs again when
+# something that sets the margins changes (which labels are present, the
+# widest tick label) instead of bbox_inches='tight' on every save.
+_figure_pool = {}
+
+def _pooled_axes(kind, figsize, dpi):
+    key = (kind, figsize, dpi)
+    if key not in _figure_pool:
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        _figure_pool[key] = {'fig': fig, 'ax': ax, 'layout': None}
+    return _figure_pool[key]
+
+def _layout_signature(ax):
+    # what tight_layout's margins depend on, without drawing anything
+    ticks = []
+    for axis in (ax.xaxis, ax.yaxis):
+        formatter = axis.get_major_formatter()
+        labels = formatter.format_ticks(axis.get_majorticklocs())
+        ticks.append((max(map(len, labels), default=0), formatter.get_offset()))
+    return (bool(ax.get_title()), bool(ax.get_xlabel()), bool(ax.get_ylabel()), *ticks)
+
+def render_spec(spec):
+    start = time.perf_counter()
+    entry = _pooled_axes(spec.get('kind', 'line'), spec.get('figsize', (6, 4)), spec.get('dpi', 100))
+    fig, ax = entry['fig'], entry['ax']
+    for artist in list(ax.lines) + list(ax.collections) + list(ax.patches):
+        artist.remove()
+    ax.containers.clear()
+    kind, x, y = spec.get('kind', 'line'), spec['x'], spec['y']
+    if kind == 'line':
+        ax.plot(x, y, color='C0')
+    elif kind == 'scatter':
+        ax.scatter(x, y, s=20, c=y, cmap='viridis')
+    elif kind == 'bar':
+        ax.bar(x, y, color='tab:blue', edgecolor='k')
+    else:
+        raise ValueError(f"unknown plot kind: {kind!r}")
+    ax.relim()
+    ax.autoscale_view()
+    ax.set_title(spec.get('title', ''))
+    ax.set_xlabel(spec.get('xlabel', ''))
+    ax.set_ylabel(spec.get('ylabel', ''))
+    layout = _layout_signature(ax)
+    if entry['layout'] != layout:           # margins cached until the text around the axes changes
+        fig.tight_layout()
+        entry['layout'] = layout
+    fig.savefig(spec['path'])
+    return spec['path'], time.perf_counter() - start
+
+def render_batch(specs, workers=None):
+    if workers:
+        with ProcessPoolExecutor(workers) as pool:
+            return list(pool.map(render_spec, specs, chunksize=max(1, len(specs) // (4*workers))))
+    return [render_spec(spec) for spec in specs]
+
+os.makedirs('reports', exist_ok=True)
+specs = [{'kind': ['line', 'scatter', 'bar'][i % 3], 'x': np.arange(20), 'y': np.random.rand(20),
+          'title': f'Report {i}', 'xlabel': 'x', 'ylabel': 'y', 'path': f'reports/report_{i}.png'}
+         for i in range(30)]
+timings = render_batch(specs)   # workers=N spreads specs over N processes
+for path, seconds in timings[:3]:
+    print(f"{path}: {seconds*1000:.1f} ms")
+print(f"total: {sum(s for _, s in timings):.2f}s for {len(timings)} figures")
+
+
+# -------------------------------------------
+# Level-of-detail plotting for huge series (min/max per pixel column)
+# -------------------------------------------
+# Only the min and max sample of each pixel column are drawn, which keeps the
+# visual envelope of the line. The full arrays stay as they are (e.g. a
+# np.memmap) and are re-decimated for the visible range on every zoom/pan.
+def minmax_decimate(x, y, xmin, xmax, n_bins):
+    lo = max(np.searchsorted(x, xmin) - 1, 0)           # x must be sorted
+    hi = min(np.searchsorted(x, xmax) + 1, len(x))
+    xs, ys = x[lo:hi], y[lo:hi]                         # views, no copy of the full data
+    if len(xs) <= 2*n_bins:
+        return np.asarray(xs), np.asarray(ys)
+    edges = np.linspace(xs[0], xs[-1], n_bins + 1)[1:-1]
+    bounds = np.unique(np.r_[0, np.searchsorted(xs, edges), len(xs)])   # empty columns collapse
+    keep = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):    # one pixel column at a time, no full-length temporaries
+        seg = ys[start:stop]
+        try:
+            i, j = np.nanargmin(seg), np.nanargmax(seg)
+        except ValueError:                              # all NaN: keep one NaN so the line breaks here
+            keep.append(start)
+            continue
+        keep.extend((start + min(i, j), start + max(i, j)) if i != j else (start + i,))
+    keep = np.array(keep, dtype=np.intp)
+    return np.asarray(xs[keep]), np.asarray(ys[keep])
+
+def plot_decimated(ax, x, y, kind='line', **kwargs):
+    def redraw(ax):
+        xmin, xmax = ax.get_xlim()
+        xd, yd = minmax_decimate(x, y, xmin, xmax, max(int(ax.bbox.width), 1))
+        if kind == 'line':
+            artist.set_data(xd, yd)
+        else:
+            artist.set_offsets(np.column_stack([xd, yd]))
+        ax.figure.canvas.draw_idle()
+
+    xd, yd = minmax_decimate(x, y, x[0], x[-1], max(int(ax.bbox.width), 1))
+    artist = ax.plot(xd, yd, **kwargs)[0] if kind == 'line' else ax.scatter(xd, yd, **kwargs)
+    ax.set_xlim(x[0], x[-1])
+    ax.set_ylim(np.nanmin(y), np.nanmax(y))             # telemetry may have NaN gaps
+    ax.callbacks.connect('xlim_changed', redraw)        # re-decimate on zoom/pan
+    return artist
+
+n = 2_000_000
+telemetry_dir = tempfile.mkdtemp()                      # the view re-reads it on zoom, so removed at exit
+atexit.register(shutil.rmtree, telemetry_dir, ignore_errors=True)
+tx_path, ty_path = os.path.join(telemetry_dir, 'x.dat'), os.path.join(telemetry_dir, 'y.dat')
+np.linspace(0, 100, n).tofile(tx_path)
+(np.sin(np.linspace(0, 100, n)) + 0.1*np.random.randn(n)).tofile(ty_path)
+tx = np.memmap(tx_path, dtype=np.float64, mode='r')
+ty = np.memmap(ty_path, dtype=np.float64, mode='r')
+fig, ax = plt.subplots()
+lod_line = plot_decimated(ax, tx, ty, color='C0', linewidth=1)
+print("points drawn:", len(lod_line.get_xdata()), "of", n)
+ax.set_xlim(10, 11)                                     # zoom: re-decimated from the full data
+print("points drawn after zoom:", len(lod_line.get_xdata()))
+
+
+# -------------------------------------------
+# Vectorized cell labels for large heatmaps
+# -------------------------------------------
+# One artist draws every visible label instead of one ax.text artist per
+# cell. Labels are formatted with a single np.char.mod call; on Agg each
+# distinct label is rasterized once and stamped into one overlay image with
+# array indexing, which is drawn with a single draw_image call. Nothing is
+# drawn when the cells are too small to read at the current zoom.
+class CellLabels(Artist):
+    def __init__(self, matrix, fmt='%.1f', fontsize=8, color='white'):
+        super().__init__()
+        self.labels = np.char.mod(fmt, matrix)
+        self.prop = FontProperties(size=fontsize)
+        self.color = color
+        self._sprites = {}
+
+    def _sprite(self, renderer, label):
+        key = (label, renderer.dpi)
+        if key not in self._sprites:
+            w, h, d = renderer.get_text_width_height_descent(label, self.prop, ismath=False)
+            width, height = int(np.ceil(w)) + 2, int(np.ceil(h)) + 2
+            r = RendererAgg(width, height, renderer.dpi)
+            gc = r.new_gc()
+            gc.set_foreground(self.color)
+            r.draw_text(gc, 1, height - 1 - d, label, self.prop, 0)   # baseline, y measured from top
+            self._sprites[key] = np.asarray(r.buffer_rgba()).copy()
+        return self._sprites[key]
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        ax = self.axes
+        rows, cols = self.labels.shape
+        x0, x1 = sorted(ax.get_xlim())
+        y0, y1 = sorted(ax.get_ylim())
+        j = np.arange(max(int(np.floor(x0 + 0.5)), 0), min(int(np.ceil(x1 + 0.5)), cols))
+        i = np.arange(max(int(np.floor(y0 + 0.5)), 0), min(int(np.ceil(y1 + 0.5)), rows))
+        if len(i) == 0 or len(j) == 0:
+            return
+        jj, ii = np.meshgrid(j, i)
+        visible = self.labels[ii, jj].ravel()
+        p0, p1 = ax.transData.transform([[0, 0], [1, 1]])
+        cell_w, cell_h = np.abs(p1 - p0)
+        w, h, _ = renderer.get_text_width_height_descent(max(visible, key=len), self.prop, ismath=False)
+        if cell_w < w or cell_h < h:
+            return                                      # illegible at this zoom
+        centers = ax.transData.transform(np.column_stack([jj.ravel(), ii.ravel()]))
+        gc = renderer.new_gc()
+        gc.set_clip_rectangle(ax.bbox)
+        renderer.open_group('cell_labels', gid=self.get_gid())
+        if isinstance(renderer, RendererAgg):
+            bx0, by0 = int(round(ax.bbox.x0)), int(round(ax.bbox.y0))
+            bw, bh = int(np.ceil(ax.bbox.width)), int(np.ceil(ax.bbox.height))
+            uniq, inverse = np.unique(visible, return_inverse=True)
+            sprites = [self._sprite(renderer, label) for label in uniq]
+            pad = max(max(s.shape[:2]) for s in sprites)
+            overlay = np.zeros((bh + 2*pad, bw + 2*pad, 4), dtype=np.uint8)
+            for k, sprite in enumerate(sprites):
+                sh, sw = sprite.shape[:2]
+                cx, cy = centers[inverse == k].T
+                top = np.round(bh - (cy - by0) - sh/2).astype(int) + pad
+                left = np.round(cx - bx0 - sw/2).astype(int) + pad
+                top, left = np.clip(top, 0, bh + pad), np.clip(left, 0, bw + pad)
+                overlay[top[:, None, None] + np.arange(sh)[None, :, None],
+                        left[:, None, None] + np.arange(sw)[None, None, :]] = sprite
+            renderer.draw_image(gc, bx0, by0, overlay[pad:pad + bh, pad:pad + bw][::-1])
+        else:                                           # vector backends draw real text
+            gc.set_foreground(self.color)
+            canvas_h = renderer.get_canvas_width_height()[1]
+            flip = renderer.flipy()                     # SVG counts y down, PDF/PS count it up
+            for (x, y), label in zip(centers, visible):
+                w, h, d = renderer.get_text_width_height_descent(label, self.prop, ismath=False)
+                baseline = y - h/2 + d
+                renderer.draw_text(gc, x - w/2, canvas_h - baseline if flip else baseline, label, self.prop, 0)
+        renderer.close_group('cell_labels')
+        gc.restore()
+        self.stale = False
+
+fig, ax = plt.subplots()
+ax.imshow(matrix, cmap='viridis')
+ax.add_artist(CellLabels(matrix))
+
+# Benchmark against the per-cell ax.text loop
+big_matrix = np.random.rand(100, 100)
+for label, use_artist in [('ax.text loop', False), ('CellLabels', True)]:
+    fig, ax = plt.subplots(figsize=(20, 20))
+    ax.imshow(big_matrix, cmap='viridis')
+    start = time.perf_counter()
+    if use_artist:
+        ax.add_artist(CellLabels(big_matrix, fontsize=6))
+    else:
+        for (i,j), val in np.ndenumerate(big_matrix):
+            ax.text(j, i, f"{val:.1f}", ha='center', va='center', fontsize=6)
+    fig.canvas.draw()
+    print(f"{label}: {time.perf_counter() - start:.2f}s")
+    plt.close(fig)
+
+
+# -------------------------------------------
+# Tiled image pyramid for very large grids (imshow / pcolormesh / contourf)
+# -------------------------------------------
+# Downsampled levels (2x2 mean or max pooling) are built once into memmap
+# files. On every zoom/pan only the tiles of the level that matches the
+# current view and screen resolution are read and drawn.
+def build_pyramid(base, path_prefix, reduce='mean', block=1024, top_size=512):
+    pool = np.mean if reduce == 'mean' else np.max
+    levels = [base]
+    while max(levels[-1].shape) > top_size:
+        src = levels[-1]
+        h, w = src.shape[0] // 2, src.shape[1] // 2
+        dst = np.memmap(f'{path_prefix}.L{len(levels)}', dtype=np.float32, mode='w+', shape=(h, w))
+        for r in range(0, h, block):                    # row blocks keep memory bounded
+            rows = np.asarray(src[2*r:2*min(r + block, h), :2*w], dtype=np.float32)
+            dst[r:r + block] = pool(rows.reshape(-1, 2, w, 2), axis=(1, 3))
+        dst.flush()
+        levels.append(dst)
+    return levels
+
+class PyramidView:
+    def __init__(self, ax, pyramid, kind='image', tile=256, max_tiles=256, **kwargs):
+        self.ax, self.levels, self.kind, self.tile = ax, pyramid, kind, tile
+        self.max_tiles, self._tiles = max_tiles, {}
+        top = np.asarray(pyramid[-1])
+        kwargs.setdefault('vmin', float(top.min()))     # fixed color scale across levels
+        kwargs.setdefault('vmax', float(top.max()))
+        self.kwargs, self.artist = kwargs, None
+        h, w = pyramid[0].shape
+        ax.set_xlim(-0.5, w - 0.5)
+        ax.set_ylim(h - 0.5, -0.5)
+        ax.callbacks.connect('xlim_changed', self.update)
+        ax.callbacks.connect('ylim_changed', self.update)
+        self.update(ax)
+
+    def _tile(self, level, ty, tx):
+        key = (level, ty, tx)
+        if key not in self._tiles:
+            if len(self._tiles) >= self.max_tiles:
+                self._tiles.pop(next(iter(self._tiles)))  # drop the oldest tile
+            t = self.tile
+            self._tiles[key] = np.asarray(self.levels[level][ty*t:(ty + 1)*t, tx*t:(tx + 1)*t])
+        return self._tiles[key]
+
+    def update(self, ax=None):
+        ax, t = self.ax, self.tile
+        x0, x1 = sorted(ax.get_xlim())
+        y0, y1 = sorted(ax.get_ylim())
+        box = ax.get_position(original=True).transformed(ax.figure.transFigure)  # before aspect shrink
+        per_pixel = max((x1 - x0) / max(box.width, 1), (y1 - y0) / max(box.height, 1))
+        level = int(np.clip(np.floor(np.log2(max(per_pixel, 1))), 0, len(self.levels) - 1))
+        scale = 2 ** level
+        lh, lw = self.levels[level].shape
+        c0, c1 = max(int((x0 + 0.5) // scale), 0), min(int(np.ceil((x1 + 0.5) / scale)), lw)
+        r0, r1 = max(int((y0 + 0.5) // scale), 0), min(int(np.ceil((y1 + 0.5) / scale)), lh)
+        if c1 <= c0 or r1 <= r0:
+            return
+        tx0, ty0 = c0 // t, r0 // t
+        window = np.block([[self._tile(level, ty, tx) for tx in range(tx0, (c1 - 1)//t + 1)]
+                           for ty in range(ty0, (r1 - 1)//t + 1)])
+        left, top = tx0*t*scale - 0.5, ty0*t*scale - 0.5
+        extent = (left, left + window.shape[1]*scale, top + window.shape[0]*scale, top)
+        if self.kind == 'image':
+            if self.artist is None:
+                self.artist = ax.imshow(window, extent=extent, origin='upper', **self.kwargs)
+            else:
+                self.artist.set_data(window)
+                self.artist.set_extent(extent)
+        else:
+            if self.artist is not None:
+                self.artist.remove()
+            xs = left + 0.5*scale + scale*np.arange(window.shape[1])
+            ys = top + 0.5*scale + scale*np.arange(window.shape[0])
+            self.artist = ax.contourf(xs, ys, window, **self.kwargs)
+        ax.figure.canvas.draw_idle()
+
+# 4096x4096 grid kept in a memmap and written row block by row block
+size = 4096
+grid_dir = tempfile.mkdtemp()                            # tiles are read on zoom, so removed at exit
+atexit.register(shutil.rmtree, grid_dir, ignore_errors=True)
+grid = np.memmap(os.path.join(grid_dir, 'grid.dat'), dtype=np.float32, mode='w+', shape=(size, size))
+gx = np.linspace(-3, 3, size, dtype=np.float32)
+for r in range(0, size, 512):
+    grid[r:r + 512] = np.sin(gx[None, :]**2 + gx[r:r + 512, None]**2)
+grid.flush()
+pyramid = build_pyramid(grid, os.path.join(grid_dir, 'grid'), reduce='mean')
+fig, ax = plt.subplots()
+view = PyramidView(ax, pyramid, cmap='viridis')          # kind='contourf' for filled contours
+ax.set_xlim(1000, 1200)                                  # zoom in: full-resolution tiles only
+ax.set_ylim(1200, 1000)
+fig.savefig('pyramid.png')
+
+
+# -------------------------------------------
+# Adaptive 3D surfaces and point clouds
+# -------------------------------------------
+# Grid lines are picked where the surface bends most (second differences),
+# so a polygon budget is spent on curved regions instead of flat ones. A
+# coarse mesh is shown while the mouse is held down to rotate and the
+# refined mesh comes back on release; both meshes are cached.
+def curvature_lines(Z, count, axis):
+    bend = np.abs(np.diff(Z, 2, axis=axis)).sum(axis=1 - axis)
+    weight = np.r_[0, bend, 0] + bend.mean() + 1e-12   # baseline keeps flat areas sampled
+    cdf = np.cumsum(weight)
+    cdf = (cdf - cdf[0]) / (cdf[-1] - cdf[0])
+    return np.unique(np.searchsorted(cdf, np.linspace(0, 1, count)))
+
+class AdaptiveSurface:
+    def __init__(self, ax, X, Y, Z, budget=2500, interactive_budget=400, **kwargs):
+        self.ax, self.X, self.Y, self.Z, self.kwargs = ax, X, Y, Z, kwargs
+        self._meshes = {}
+        self.fine = self._surface(budget)
+        self.coarse = self._surface(interactive_budget)
+        self.coarse.set_visible(False)
+        ax.figure.canvas.mpl_connect('button_press_event', self._on_press)
+        ax.figure.canvas.mpl_connect('button_release_event', self._on_release)
+
+    def _surface(self, budget):
+        if budget not in self._meshes:
+            n = int(np.sqrt(budget)) + 1                # about budget quads
+            rows = curvature_lines(self.Z, min(n, self.Z.shape[0]), axis=0)
+            cols = curvature_lines(self.Z, min(n, self.Z.shape[1]), axis=1)
+            ix = np.ix_(rows, cols)
+            self._meshes[budget] = self.ax.plot_surface(self.X[ix], self.Y[ix], self.Z[ix],
+                                                        rstride=1, cstride=1, **self.kwargs)
+        return self._meshes[budget]
+
+    def _show_coarse(self, coarse):
+        self.coarse.set_visible(coarse)
+        self.fine.set_visible(not coarse)
+        self.ax.figure.canvas.draw_idle()
+
+    def _on_press(self, event):
+        if event.inaxes is self.ax:
+            self._show_coarse(True)
+
+    def _on_release(self, event):
+        if self.coarse.get_visible():
+            self._show_coarse(False)
+
+def voxel_decimate(xs, ys, zs, voxels=32):
+    # indices of one point per occupied voxel
+    pts = np.column_stack([xs, ys, zs])
+    lo, span = pts.min(axis=0), np.ptp(pts, axis=0)
+    cells = np.minimum((pts - lo) / np.where(span > 0, span, 1) * voxels, voxels - 1).astype(np.int64)
+    key = (cells[:, 0]*voxels + cells[:, 1])*voxels + cells[:, 2]
+    return np.sort(np.unique(key, return_index=True)[1])
+
+fig = plt.figure()
+ax = fig.add_subplot(111, projection='3d')
+X, Y = np.meshgrid(np.linspace(-3, 3, 600), np.linspace(-3, 3, 600))
+Z = np.sin(X**2+Y**2)
+surface = AdaptiveSurface(ax, X, Y, Z, budget=2500, cmap='coolwarm')
+fig = plt.figure()
+ax = fig.add_subplot(111, projection='3d')
+pts = np.random.randn(200_000, 3)
+keep = voxel_decimate(*pts.T, voxels=24)
+ax.scatter3D(*pts[keep].T, c=pts[keep, 2], cmap='viridis', s=2)
+print("surface quads:", len(surface.fine.get_array()), "of", (Z.shape[0] - 1)*(Z.shape[1] - 1))
+print("scatter points:", len(keep), "of", len(pts))
@@ -1,5 +1,9 @@
 import numpy as np
+import os
+import shutil
 import statistics as stats
+import tempfile
+import time
 
 arr1 = np.array([1, 2, 3, 4, 5])
 arr2 = np.array([6, 7, 8, 9, 10])
@@ -57,3 +61,298 @@ print("Median: ", np.median(arr1))
 print("Mode: ", stats.mode(arr4))
 print("Standard Deviation: ", np.std(arr1))
 print(np.corrcoef([arr1, arr2]))
+
+# Growable array buffer (amortized O(1) append instead of np.append in a loop)
+# np.append/np.insert/np.delete copy the whole array on every call. The buffer
+# below over-allocates and doubles its capacity, so appends are amortized O(1).
+class GrowableArray:
+    def __init__(self, dtype=float, capacity=16):
+        self._buf = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def view(self):
+        return self._buf[:self._size]  # plain ndarray view, no copy
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed > len(self._buf):
+            new = np.empty(max(needed, 2 * len(self._buf)), dtype=self._buf.dtype)
+            new[:self._size] = self.view
+            self._buf = new
+
+    def append(self, values):
+        values = np.atleast_1d(values)
+        self._reserve(len(values))
+        self._buf[self._size:self._size + len(values)] = values
+        self._size += len(values)
+
+    def insert(self, index, values):
+        if not -self._size <= index <= self._size:  # same bounds as np.insert
+            raise IndexError(f"index {index} is out of bounds for axis 0 with size {self._size}")
+        index = index + self._size if index < 0 else index
+        values = np.atleast_1d(values)
+        k = len(values)
+        self._reserve(k)
+        self._buf[index + k:self._size + k] = self._buf[index:self._size]  # shift tail in place
+        self._buf[index:index + k] = values
+        self._size += k
+
+    def delete(self, indices):
+        keep = np.ones(self._size, dtype=bool)
+        keep[indices] = False
+        kept = self.view[keep]
+        self._buf[:len(kept)] = kept
+        self._size = len(kept)
+
+buf = GrowableArray(dtype=arr3.dtype)
+buf.append(arr3)
+buf.insert(3, 20)
+buf.delete([1])
+print("GrowableArray:", buf.view)  # same as np.delete(np.insert(arr3, 3, 20), 1)
+
+# Benchmark: 20,000 single appends
+start = time.perf_counter()
+out = np.array([], dtype=np.int64)
+for i in range(20_000):
+    out = np.append(out, i)
+print(f"np.append loop: {time.perf_counter() - start:.3f}s")
+start = time.perf_counter()
+buf = GrowableArray(dtype=np.int64)
+for i in range(20_000):
+    buf.append(i)
+print(f"GrowableArray loop: {time.perf_counter() - start:.3f}s")
+
+# Single-pass streaming statistics (sum, min, max, mean, std, median, mode, corrcoef)
+# Chunks are folded into one accumulator. Variance/covariance use Welford's
+# update (Chan's form for merging), the median comes from a small mergeable
+# quantile sketch, and mode keeps a bounded Misra-Gries summary (exact while a
+# stream has at most mode_size distinct values) instead of statistics.mode.
+# Accumulators from different processes can be combined with merge().
+def compact_sketch(levels, k, rng):
+    # levels[i] holds samples that each stand for 2**i original values
+    i = 0
+    while i < len(levels):
+        if len(levels[i]) > k:
+            s = np.sort(levels[i])
+            keep = s[-1:] if len(s) % 2 else s[:0]
+            s = s[:len(s) - len(keep)]
+            if i + 1 == len(levels):
+                levels.append(s[:0])
+            levels[i + 1] = np.concatenate([levels[i + 1], s[rng.integers(2)::2]])
+            levels[i] = keep
+        i += 1
+    return levels
+
+def sketch_quantile(levels, q):
+    values = np.concatenate(levels)
+    weights = np.concatenate([np.full(len(l), 2 ** i) for i, l in enumerate(levels)])
+    order = np.argsort(values, kind="stable")
+    cum = np.cumsum(weights[order])
+    return values[order][np.searchsorted(cum, q * cum[-1])]
+
+def frequent_items(values, counts, k):
+    # Misra-Gries: keep at most k counters; any value seen more than n/(k+1)
+    # times survives, with its count low by at most n/(k+1)
+    if len(values) > k:
+        cut = np.partition(counts, len(counts) - k - 1)[len(counts) - k - 1]
+        counts = counts - cut
+        keep = counts > 0
+        values, counts = values[keep], counts[keep]
+    return values, counts
+
+def zip_levels(a, b):
+    for i in range(max(len(a), len(b))):
+        yield [l[i] for l in (a, b) if i < len(l)]
+
+class StreamingStats:
+    def __init__(self, sketch_size=512, mode_size=256, seed=0):
+        self.k, self.mode_size = sketch_size, mode_size
+        self.rng = np.random.default_rng(seed)      # sketch compaction is reproducible
+        self.n = 0
+
+    def update(self, chunk):
+        # rows are variables (like np.corrcoef); returns this chunk's running cumsum
+        raw = np.atleast_2d(np.asarray(chunk))
+        x = raw.astype(float)
+        part = StreamingStats(self.k, self.mode_size)
+        part.n = x.shape[1]
+        if part.n == 0:
+            return x
+        part.sum, part.min, part.max = x.sum(axis=1), x.min(axis=1), x.max(axis=1)
+        part.mean = x.mean(axis=1)
+        d = x - part.mean[:, None]
+        part.comoment = d @ d.T
+        part.sketches = [compact_sketch([row], self.k, self.rng) for row in x]
+        part.counts = [frequent_items(*np.unique(row, return_counts=True), self.mode_size) for row in raw]
+        offset = self.sum[:, None] if self.n else 0
+        self.merge(part)
+        cumsum = offset + np.cumsum(x, axis=1)
+        return cumsum[0] if np.ndim(chunk) == 1 else cumsum
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update({k: v for k, v in other.__dict__.items() if k not in ("k", "mode_size", "rng")})
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * self.n * other.n / n
+        self.mean = self.mean + delta * other.n / n
+        self.sum = self.sum + other.sum
+        self.min, self.max = np.minimum(self.min, other.min), np.maximum(self.max, other.max)
+        self.sketches = [compact_sketch([np.concatenate(p) for p in zip_levels(a, b)], self.k, self.rng)
+                         for a, b in zip(self.sketches, other.sketches)]
+        merged = []
+        for (va, ca), (vb, cb) in zip(self.counts, other.counts):
+            values, inverse = np.unique(np.concatenate([va, vb]), return_inverse=True)
+            counts = np.bincount(inverse, weights=np.concatenate([ca, cb])).astype(np.int64)
+            merged.append(frequent_items(values, counts, self.mode_size))   # stays <= mode_size entries
+        self.counts = merged
+        self.n = n
+        return self
+
+    def quantile(self, q):
+        return self._squeeze(np.array([sketch_quantile(s, q) for s in self.sketches]))
+
+    def result(self):
+        var = np.diag(self.comoment) / self.n
+        return {
+            "sum": self._squeeze(self.sum), "max": self._squeeze(self.max),
+            "min": self._squeeze(self.min), "size": self.n,
+            "mean": self._squeeze(self.mean), "median": self.quantile(0.5),
+            # smallest value on ties; NaN when no value is frequent enough to keep a counter
+            "mode": self._squeeze(np.array([v[np.argmax(c)] if len(c) else np.nan for v, c in self.counts])),
+            "std": self._squeeze(np.sqrt(var)),
+            "corrcoef": self.comoment / np.sqrt(np.outer(np.diag(self.comoment), np.diag(self.comoment))),
+        }
+
+    @staticmethod
+    def _squeeze(v):
+        return v[0] if len(v) == 1 else v
+
+def stats_from_file(path, dtype, chunk_size=1 << 20):
+    data = np.memmap(path, dtype=dtype, mode="r")  # never loaded fully into RAM
+    acc = StreamingStats()
+    for start in range(0, len(data), chunk_size):
+        acc.update(data[start:start + chunk_size])
+    return acc
+
+acc = StreamingStats()
+for chunk in np.array_split(arr1, 2):
+    print("Streaming cumsum chunk:", acc.update(chunk))
+print("Streaming stats:", acc.result())
+acc4 = StreamingStats()
+acc4.update(arr4[:5])
+other = StreamingStats()
+other.update(arr4[5:])
+print("Merged mode:", acc4.merge(other).result()["mode"])
+pair = StreamingStats()
+pair.update(np.vstack([arr1, arr2]))
+print("Streaming corrcoef:\n", pair.result()["corrcoef"])
+stats_dir = tempfile.mkdtemp()
+arr4.tofile(os.path.join(stats_dir, "stats_demo.dat"))
+print("Memmap median:", stats_from_file(os.path.join(stats_dir, "stats_demo.dat"), arr4.dtype).quantile(0.5))
+shutil.rmtree(stats_dir)
+
+# Sorted key index for batched point/range queries (np.searchsorted instead of np.where)
+# Keys are sorted once and the argsort permutation is kept, so every query is
+# O(log n) and maps back to original positions. Inserts go to a small delta
+# buffer (a GrowableArray) that is merged into the main arrays periodically.
+class SortedIndex:
+    def __init__(self, keys, merge_threshold=4096):
+        keys = np.asarray(keys)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+        self.next_id = len(keys)
+        self.threshold = merge_threshold
+        self._reset_delta()
+
+    def _reset_delta(self):
+        self.delta_keys = GrowableArray(self.keys.dtype)
+        self.delta_ids = GrowableArray(np.int64)
+        self._delta_sorted = None
+
+    def _delta(self):
+        if self._delta_sorted is None:
+            d = np.argsort(self.delta_keys.view, kind="stable")
+            self._delta_sorted = (self.delta_keys.view[d], self.delta_ids.view[d])
+        return self._delta_sorted
+
+    def insert(self, values):
+        values = np.atleast_1d(values)
+        self.delta_keys.append(values)
+        self.delta_ids.append(np.arange(self.next_id, self.next_id + len(values)))
+        self.next_id += len(values)
+        self._delta_sorted = None
+        if len(self.delta_keys) > self.threshold:
+            self.merge()
+
+    def merge(self):
+        dk, di = self._delta()
+        pos = np.searchsorted(self.keys, dk, side="right")  # linear merge of two sorted runs
+        self.keys = np.insert(self.keys, pos, dk)
+        self.order = np.insert(self.order, pos, di)
+        self._reset_delta()
+
+    def _parts(self):
+        yield self.keys, self.order
+        if len(self.delta_keys):
+            yield self._delta()
+
+    def count_range(self, lo, hi):
+        # number of keys with lo <= key < hi, for arrays of bounds
+        return sum(np.searchsorted(k, hi, "left") - np.searchsorted(k, lo, "left") for k, _ in self._parts())
+
+    def count(self, values):
+        return sum(np.searchsorted(k, values, "right") - np.searchsorted(k, values, "left") for k, _ in self._parts())
+
+    def find(self, values):
+        # original position of one matching key per value, -1 if missing
+        values = np.asarray(values)
+        out = np.full(values.shape, -1, dtype=np.int64)
+        for keys, ids in self._parts():
+            if len(keys) == 0:
+                continue
+            i = np.minimum(np.searchsorted(keys, values, "left"), len(keys) - 1)
+            hit = (out < 0) & (keys[i] == values)
+            out[hit] = ids[i[hit]]
+        return out
+
+    def range(self, lo, hi):
+        # original positions of keys with lo <= key < hi, ascending like np.where. For
+        # arrays of bounds returns (offsets, ids): query q gets ids[offsets[q]:offsets[q+1]]
+        scalar = np.ndim(lo) == 0 and np.ndim(hi) == 0
+        lo, hi = (a.ravel() for a in np.broadcast_arrays(np.atleast_1d(lo), np.atleast_1d(hi)))
+        queries, found = [], []
+        for keys, ids in self._parts():
+            start = np.searchsorted(keys, lo, "left")
+            n = np.maximum(np.searchsorted(keys, hi, "left") - start, 0)
+            queries.append(np.repeat(np.arange(len(lo)), n))
+            found.append(ids[np.repeat(start - np.cumsum(n) + n, n) + np.arange(n.sum())])
+        queries, found = np.concatenate(queries), np.concatenate(found)
+        found = found[np.lexsort((found, queries))]   # by query, then by position
+        if scalar:
+            return found
+        return np.r_[0, np.cumsum(np.bincount(queries, minlength=len(lo)))], found
+
+idx = SortedIndex(arr3)
+idx.insert([20, 40])
+print("Index find [30, 99]:", idx.find([30, 99]))
+print("Index count [40]:", idx.count([40]))
+print("Index range [20, 45):", idx.range(20, 45))  # positions, like np.where((arr >= 20) & (arr < 45))[0]
+offsets, ids = idx.range([20, 0], [45, 35])              # one batch of range queries
+print("Index ranges [20, 45), [0, 35):", np.split(ids, offsets[1:-1]))
+
+keys = np.random.randint(0, 10_000_000, 1_000_000)
+lo = np.random.randint(0, 10_000_000, 200)
+start = time.perf_counter()
+slow = [len(np.where((keys >= l) & (keys < l + 1000))[0]) for l in lo]
+print(f"np.where range counts: {time.perf_counter() - start:.3f}s")
+start = time.perf_counter()
+fast = SortedIndex(keys).count_range(lo, lo + 1000)
+print(f"SortedIndex range counts (incl. build): {time.perf_counter() - start:.3f}s")
@@ -1,5 +1,17 @@
 import pandas as pd
 import numpy as np
+import json
+import time
+import tracemalloc
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 # From dictionary
 df = pd.DataFrame({
@@ -80,3 +92,899 @@ df["Month"] = df["Date"].dt.month
 df.to_csv("output.csv", index=False)
 df.to_excel("output.xlsx", index=False)
 df.to_json("output.json")
+
+
+# Chunked groupby for CSV files that don't fit in memory
+# Each chunk is reduced to per-group partial state (count, sum, min, max, m2),
+# partials are merged, and the final stats are computed once at the end.
+# Peak memory is bounded by chunksize, not by the size of the file.
+def chunk_partials(chunk, by, cols):
+    parts = {}
+    for col in cols:
+        s = chunk.groupby(by)[col]
+        p = pd.DataFrame({"count": s.count(), "sum": s.sum(), "min": s.min(), "max": s.max()})
+        dev = chunk[col] - chunk[by].map(p["sum"] / p["count"])
+        p["m2"] = (dev ** 2).groupby(chunk[by]).sum()
+        parts[col] = p
+    return parts
+
+def merge_partials(a, b):
+    # count/sum/min/max merge in one groupby, so no reindex turns them into float64
+    out = pd.concat([a, b]).groupby(level=0).agg({"count": "sum", "sum": "sum", "min": "min", "max": "max"})
+    na, nb = a["count"].reindex(out.index, fill_value=0), b["count"].reindex(out.index, fill_value=0)
+    sa, sb = a["sum"].reindex(out.index, fill_value=0), b["sum"].reindex(out.index, fill_value=0)
+    delta = (sb / nb - sa / na).fillna(0)   # Chan et al. parallel variance update
+    out["m2"] = (a["m2"].reindex(out.index).fillna(0) + b["m2"].reindex(out.index).fillna(0)
+                 + (delta ** 2 * na * nb / out["count"]).fillna(0))
+    return out
+
+def merge_chunk(total, parts):
+    if total is None:
+        return parts
+    return {col: merge_partials(total[col], parts[col]) for col in total}
+
+FINALIZE = {
+    "count": lambda p: p["count"],
+    "sum": lambda p: p["sum"],
+    "min": lambda p: p["min"],
+    "max": lambda p: p["max"],
+    "mean": lambda p: p["sum"] / p["count"],
+    "var": lambda p: (p["m2"] / (p["count"] - 1)).where(p["count"] > 1),
+    "std": lambda p: np.sqrt((p["m2"] / (p["count"] - 1)).where(p["count"] > 1)),
+}
+
+def chunked_groupby(path, by, aggs, chunksize=100_000, workers=None):
+    cols = list(aggs)
+    reader = pd.read_csv(path, usecols=[by] + cols, chunksize=chunksize)
+    total = None
+    if workers:
+        # keep at most 2 chunks per worker in flight so memory stays bounded
+        with ProcessPoolExecutor(workers) as pool:
+            pending = set()
+            for chunk in reader:
+                pending.add(pool.submit(chunk_partials, chunk, by, cols))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for f in done:
+                        total = merge_chunk(total, f.result())
+            for f in pending:
+                total = merge_chunk(total, f.result())
+    else:
+        for chunk in reader:
+            total = merge_chunk(total, chunk_partials(chunk, by, cols))
+    out = pd.DataFrame({col: FINALIZE[agg](total[col]) for col, agg in aggs.items()})
+    out.index.name = by
+    return out.sort_index()
+
+big = pd.DataFrame({
+    "Grade": np.random.choice(["A", "B", "C"], 200_000),
+    "Age": np.random.randint(18, 60, 200_000),
+    "Score": np.random.randint(0, 100, 200_000),
+})
+big_dir = tempfile.mkdtemp()
+big_path = os.path.join(big_dir, "big_input.csv")
+big.to_csv(big_path, index=False)
+chunked_groupby(big_path, "Grade", {"Age": "mean", "Score": "max"}, chunksize=50_000)
+chunked_groupby(big_path, "Grade", {"Age": "var"}, chunksize=50_000)  # workers=N runs chunks in a process pool
+shutil.rmtree(big_dir)
+
+
+# Reusable join index for repeated pd.merge against a static dimension table
+# The key index on the right table is built once and reused for every new
+# batch of left rows. Unique unsorted keys use a hash lookup (pd.Index),
+# sorted or duplicated keys use a sort-merge style binary search.
+class JoinIndex:
+    def __init__(self, right, on):
+        self.on = on
+        self.right = right.reset_index(drop=True)
+        keys = pd.Index(self.right[on])
+        if keys.is_unique and not keys.is_monotonic_increasing:
+            self.method = "hash"
+            self.keys = keys                                  # hash table on the keys
+        else:
+            self.method = "merge"
+            self.order = np.argsort(keys.to_numpy(), kind="stable")
+            self.keys = keys.to_numpy()[self.order]           # sorted keys
+
+    def positions(self, left_keys):
+        if self.method == "hash":
+            right_pos = self.keys.get_indexer(left_keys)
+            left_pos = np.flatnonzero(right_pos >= 0)
+            return left_pos, right_pos[left_pos]
+        lo = np.searchsorted(self.keys, left_keys, side="left")
+        hi = np.searchsorted(self.keys, left_keys, side="right")
+        counts = hi - lo
+        left_pos = np.repeat(np.arange(len(left_keys)), counts)
+        starts = np.repeat(lo - np.cumsum(counts) + counts, counts)  # offset of each match run
+        return left_pos, self.order[starts + np.arange(len(left_pos))]
+
+    def merge(self, left, suffixes=("_x", "_y")):
+        left_pos, right_pos = self.positions(left[self.on].to_numpy())
+        lhs = left.iloc[left_pos].reset_index(drop=True)
+        rhs = self.right.drop(columns=self.on).iloc[right_pos].reset_index(drop=True)
+        common = lhs.columns.intersection(rhs.columns)
+        lhs = lhs.rename(columns={c: c + suffixes[0] for c in common})
+        rhs = rhs.rename(columns={c: c + suffixes[1] for c in common})
+        return pd.concat([lhs, rhs], axis=1)
+
+dim = JoinIndex(df2, on="ID")   # build once
+dim.merge(df1)                  # same rows as pd.merge(df1, df2, on="ID")
+
+# Benchmark against plain pd.merge (raise n towards 100M on a big machine)
+n = 1_000_000
+dim_table = pd.DataFrame({"ID": np.random.permutation(100_000), "Value": np.random.rand(100_000)})
+batch = pd.DataFrame({"ID": np.random.randint(0, 120_000, n), "Qty": np.random.randint(1, 10, n)})
+dim = JoinIndex(dim_table, on="ID")
+start = time.perf_counter()
+dim.merge(batch)
+print(f"JoinIndex.merge ({dim.method}): {time.perf_counter() - start:.3f}s for {n:,} rows")
+start = time.perf_counter()
+pd.merge(batch, dim_table, on="ID")
+print(f"pd.merge: {time.perf_counter() - start:.3f}s for {n:,} rows")
+
+
+# Cached datetime parsing and vectorized date parts
+# Timestamp columns repeat heavily, so each chunk is factorized first and
+# only its unique strings are parsed, with a format detected once per chunk.
+# Dates are kept as int64 epoch nanoseconds, so only 1677-09-21 to 2262-04-11
+# fit; dates outside raise OutOfBoundsDatetime instead of becoming NaT.
+# year/month/day/weekday come from integer arithmetic (days -> civil date),
+# and strftime formats each unique timestamp only once.
+DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%m/%d/%Y", "%d/%m/%Y", "%Y%m%d"]
+NAT = np.iinfo(np.int64).min
+
+def detect_format(sample, dayfirst=False):
+    # the candidate format that parses most of the sample, None to let pandas infer;
+    # ties go to the earlier format, so ambiguous slash dates are month-first like pd.to_datetime
+    formats = list(DATE_FORMATS)
+    if dayfirst:
+        i, j = formats.index("%m/%d/%Y"), formats.index("%d/%m/%Y")
+        formats[i], formats[j] = formats[j], formats[i]
+    parsed = {fmt: pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum() for fmt in formats}
+    best = max(parsed, key=parsed.get)
+    return best if parsed[best] else None
+
+def _epoch_ns(parsed, uniques):
+    outside = (parsed < pd.Timestamp.min) | (parsed > pd.Timestamp.max)   # NaT compares False
+    if outside.any():
+        raise pd.errors.OutOfBoundsDatetime(
+            f"{uniques[outside][0]!r} is outside the 1677-2262 range of int64 epoch nanoseconds")
+    return parsed.as_unit("ns").asi8.copy()
+
+def parse_dates(strings, chunksize=1_000_000, dayfirst=False):
+    strings = np.asarray(strings, dtype=object)
+    out = np.empty(len(strings), dtype=np.int64)
+    for start in range(0, len(strings), chunksize):
+        codes, uniques = pd.factorize(strings[start:start + chunksize])
+        fmt = detect_format(uniques[:100], dayfirst)
+        parsed = pd.to_datetime(uniques, format=fmt, errors="coerce")
+        leftover = parsed.isna()
+        parsed = _epoch_ns(parsed, uniques)
+        if leftover.any():
+            # uniques in another layout get a second, per-string pass; garbage raises like pd.to_datetime
+            mixed = pd.to_datetime(uniques[leftover], format="mixed", dayfirst=dayfirst)
+            parsed[leftover] = _epoch_ns(mixed, uniques[leftover])
+        out[start:start + chunksize] = np.where(codes >= 0, parsed[codes], NAT)
+    return out
+
+def date_parts(epoch_ns):
+    # Howard Hinnant's days-to-civil algorithm; -1 for missing dates
+    days = epoch_ns // 86_400_000_000_000
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    weekday = (days + 3) % 7                     # 1970-01-01 was a Thursday, Monday = 0
+    missing = epoch_ns == NAT
+    return {name: np.where(missing, -1, part)
+            for name, part in {"year": year, "month": month, "day": day, "weekday": weekday}.items()}
+
+def cached_strftime(epoch_ns, fmt):
+    codes, uniques = pd.factorize(epoch_ns)
+    text = pd.to_datetime(uniques, unit="ns").strftime(fmt).to_numpy(dtype=object)
+    return text[codes]
+
+events = np.array(["2021-01-01", "2021-01-02", "2021-01-03"] * 200_000, dtype=object)
+start = time.perf_counter()
+stamps = pd.to_datetime(pd.Series(events))
+years, months = stamps.dt.year, stamps.dt.month
+print(f"pd.to_datetime + .dt: {time.perf_counter() - start:.3f}s")
+start = time.perf_counter()
+parts = date_parts(parse_dates(events))
+print(f"parse_dates + date_parts: {time.perf_counter() - start:.3f}s")
+cached_strftime(parse_dates(["2005-06-14"]), "%a")   # same as datetime(2005, 6, 14).strftime("%a")
+
+
+# Incremental rolling/expanding windows for append-only data
+# The engine keeps the window state between batches: the values still in the
+# window, running sum, Welford mean/M2 for var/std, and monotonic deques for
+# min/max. Each update() consumes only the new rows and returns only their
+# outputs. to_dict()/from_dict() checkpoint the state so a restarted process
+# can resume. window=None gives expanding statistics.
+class WindowEngine:
+    def __init__(self, window=None, min_periods=None):
+        self.window = window
+        self.min_periods = min_periods if min_periods is not None else (window or 1)
+        self.pos = 0                                  # rows consumed so far
+        self.values = deque()                         # (pos, value) still inside the window
+        self.n, self.total, self.mean, self.m2 = 0, 0.0, 0.0, 0.0
+        self.mins, self.maxs = deque(), deque()       # monotonic (pos, value) deques, rolling only
+        self.low, self.high = np.inf, -np.inf         # running min/max, expanding only
+
+    def _add(self, x):
+        self.n += 1
+        self.total += x
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    def _remove(self, x):
+        self.n -= 1
+        self.total -= x
+        if self.n == 0:
+            self.total, self.mean, self.m2 = 0.0, 0.0, 0.0
+            return
+        d = x - self.mean
+        self.mean -= d / self.n
+        self.m2 -= d * (x - self.mean)
+
+    def push(self, x):
+        pos, self.pos = self.pos, self.pos + 1
+        if self.window is not None:
+            self.values.append((pos, x))
+            while self.values[0][0] <= pos - self.window:
+                old = self.values.popleft()[1]
+                if not np.isnan(old):
+                    self._remove(old)
+            while self.mins and self.mins[0][0] <= pos - self.window:
+                self.mins.popleft()
+            while self.maxs and self.maxs[0][0] <= pos - self.window:
+                self.maxs.popleft()
+        if not np.isnan(x):                           # NaNs count toward the window, not the stats
+            self._add(x)
+            if self.window is None:                   # nothing ever leaves, so two scalars suffice
+                self.low, self.high = min(self.low, x), max(self.high, x)
+            else:
+                while self.mins and self.mins[-1][1] >= x:
+                    self.mins.pop()
+                self.mins.append((pos, x))
+                while self.maxs and self.maxs[-1][1] <= x:
+                    self.maxs.pop()
+                self.maxs.append((pos, x))
+        if self.n < max(self.min_periods, 1):
+            return (np.nan,) * 6
+        var = max(self.m2, 0.0) / (self.n - 1) if self.n > 1 else np.nan
+        if self.window is None:
+            return self.total, self.total / self.n, var, np.sqrt(var), self.low, self.high
+        return self.total, self.total / self.n, var, np.sqrt(var), self.mins[0][1], self.maxs[0][1]
+
+    def update(self, values):
+        index = values.index if isinstance(values, pd.Series) else pd.RangeIndex(self.pos, self.pos + len(values))
+        rows = [self.push(float(x)) for x in np.asarray(values, dtype=float)]
+        return pd.DataFrame(rows, index=index, columns=["sum", "mean", "var", "std", "min", "max"])
+
+    def to_dict(self):
+        state = dict(vars(self))
+        for key in ("values", "mins", "maxs"):
+            state[key] = list(state[key])
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        engine = cls(state["window"], state["min_periods"])
+        engine.__dict__.update(state)
+        for key in ("values", "mins", "maxs"):
+            engine.__dict__[key] = deque(tuple(item) for item in state[key])
+        return engine
+
+ages = pd.Series([25, 30, 22, 27, 35, np.nan, 29], dtype=float, name="Age")
+rolling = WindowEngine(window=2)
+expanding = WindowEngine()
+first = rolling.update(ages.iloc[:4])["mean"]
+expanding.update(ages.iloc[:4])
+checkpoint = json.dumps(rolling.to_dict())                  # e.g. written to disk between runs
+rolling = WindowEngine.from_dict(json.loads(checkpoint))
+second = rolling.update(ages.iloc[4:])["mean"]              # only the new rows are computed
+print(pd.concat([first, second]).equals(ages.rolling(2).mean()))
+print(np.allclose(expanding.update(ages.iloc[4:])["sum"], ages.expanding().sum().iloc[4:]))
+
+
+# Memory-lean pivot/melt/stack/unstack
+# Keys are dictionary-encoded (categorical codes are used as-is, anything
+# else goes through pd.factorize once), the target slot of every value is
+# computed with integer arithmetic, and values are written straight into a
+# single preallocated output array - no tuple indexes or object copies.
+def _with_nan(codes, labels):
+    # code -1 marks a missing key; it gets its own label, first like DataFrame.pivot
+    if not (codes < 0).any():
+        return codes, labels
+    return codes.astype(np.int64) + 1, labels.insert(0, np.nan)
+
+def _encode(column):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes = column.cat.codes.to_numpy()
+        missing = codes < 0
+        used = np.zeros(len(column.cat.categories), dtype=bool)
+        used[codes[~missing]] = True
+        remap = (np.cumsum(used) - 1).astype(codes.dtype)   # drop unobserved categories
+        codes = remap[codes]
+        codes[missing] = -1
+        return _with_nan(codes, column.cat.categories[used])
+    return _with_nan(*pd.factorize(column, sort=True))
+
+def _flat_positions(row_codes, col_codes, n_cols, size):
+    flat = row_codes.astype(np.int32 if size < 2**31 else np.int64)
+    flat *= n_cols
+    flat += col_codes
+    return flat
+
+def _hole_dtype(dtype):
+    # the dtype pivot gives a grid with missing cells: datetimes keep NaT,
+    # floats stay, ints widen to float64, bools and strings fall back to object
+    if dtype.kind in "mMfc":
+        return dtype
+    return np.dtype(np.float64) if dtype.kind in "iu" else np.dtype(object)
+
+def _scatter(flat, vals, shape):
+    size = shape[0] * shape[1]
+    seen = np.zeros(size, dtype=bool)
+    seen[flat] = True
+    if np.count_nonzero(seen) != len(flat):
+        raise ValueError("Index contains duplicate entries, cannot reshape")
+    full = len(flat) == size
+    out = np.empty(size, dtype=vals.dtype if full else _hole_dtype(vals.dtype))
+    if not full:
+        out.fill(out.dtype.type("NaT") if out.dtype.kind in "mM" else np.nan)
+    out[flat] = vals
+    return out.reshape(shape)
+
+def _grid_frame(grid, index, columns, dtype):
+    frame = pd.DataFrame(grid, index=index, columns=columns)
+    # extension dtypes (str, Int64, category) went through to_numpy; restore them like pivot does
+    return frame if isinstance(dtype, np.dtype) else frame.astype(dtype)
+
+def fast_pivot(df, index, columns, values, sparse=False):
+    row_codes, row_labels = _encode(df[index])
+    col_codes, col_labels = _encode(df[columns])
+    vals = df[values].to_numpy()
+    row_index, col_index = pd.Index(row_labels, name=index), pd.Index(col_labels, name=columns)
+    shape = (len(row_labels), len(col_labels))
+    flat = _flat_positions(row_codes, col_codes, shape[1], shape[0] * shape[1])
+    if sparse:
+        # no dense seen-mask here, the full grid is what sparse output avoids
+        if len(np.unique(flat)) != len(flat):
+            raise ValueError("Index contains duplicate entries, cannot reshape")
+        from scipy import sparse as sp             # optional dependency; missing cells read as 0
+        matrix = sp.coo_matrix((vals, (row_codes, col_codes)), shape=shape)
+        return pd.DataFrame.sparse.from_spmatrix(matrix, index=row_index, columns=col_index)
+    return _grid_frame(_scatter(flat, vals, shape), row_index, col_index, df[values].dtype)
+
+def fast_melt(df, id_vars, value_vars, var_name="variable", value_name="value"):
+    n, k = len(df), len(value_vars)
+    id_vars = [id_vars] if isinstance(id_vars, str) else list(id_vars)
+    rows = np.tile(np.arange(n), k)
+    out = {col: df[col].array.take(rows) for col in id_vars}   # keeps each id column's own dtype
+    out[var_name] = pd.Categorical.from_codes(np.repeat(np.arange(k, dtype=np.int32), n), value_vars)
+    dtypes = [df[c].dtype for c in value_vars]
+    if all(isinstance(dtype, np.dtype) for dtype in dtypes):
+        values = np.empty(n * k, dtype=np.result_type(*dtypes))
+        for i, col in enumerate(value_vars):            # each column copied once into its slot
+            values[i * n:(i + 1) * n] = df[col].to_numpy()
+    else:                                               # Int64, str, category: pandas' own concat rules
+        values = pd.concat([df[col] for col in value_vars], ignore_index=True).array
+    out[value_name] = values
+    return pd.DataFrame(out, copy=False)
+
+def fast_stack(df):
+    n, k = df.shape
+    row_codes, rows = pd.factorize(df.index)           # levels must be unique, the index need not be
+    col_codes, cols = pd.factorize(df.columns)
+    index = pd.MultiIndex(levels=[rows, cols], codes=[np.repeat(row_codes, k), np.tile(col_codes, n)],
+                          names=[df.index.name, df.columns.name])
+    return pd.Series(df.to_numpy().reshape(-1), index=index)
+
+def fast_unstack(series):
+    index = series.index.remove_unused_levels()
+    row_codes, rows = _with_nan(np.asarray(index.codes[0]), index.levels[0])
+    col_codes, cols = _with_nan(np.asarray(index.codes[1]), index.levels[1])
+    flat = _flat_positions(row_codes, col_codes, len(cols), len(rows) * len(cols))
+    grid = _scatter(flat, series.to_numpy(), (len(rows), len(cols)))
+    return _grid_frame(grid, rows, cols, series.dtype)
+
+def peak_memory(func, *args, **kwargs):
+    tracemalloc.start()
+    result = func(*args, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak / 2**20
+
+names = np.array([f"name{i:05d}" for i in range(5_000)], dtype=object)
+grades = [f"grade{j:03d}" for j in range(100)]
+long_df = pd.DataFrame({"Name": pd.Categorical(np.repeat(names, 100)),
+                        "Grade": pd.Categorical(np.tile(grades, 5_000)),
+                        "Age": np.random.randint(18, 60, 500_000)})
+wide_df = fast_pivot(long_df, "Name", "Grade", "Age")
+wide_flat = wide_df.reset_index()
+wide_flat.columns.name = None
+for label, stock, fast in [
+    ("pivot", lambda: long_df.pivot(index="Name", columns="Grade", values="Age"),
+              lambda: fast_pivot(long_df, "Name", "Grade", "Age")),
+    ("melt", lambda: wide_flat.melt(id_vars="Name", value_vars=grades),
+             lambda: fast_melt(wide_flat, "Name", grades)),
+    ("stack", lambda: wide_df.stack(),
+              lambda: fast_stack(wide_df)),
+    ("unstack", lambda: wide_df.stack().unstack(),
+                lambda: fast_unstack(fast_stack(wide_df))),
+]:
+    _, stock_mb = peak_memory(stock)
+    _, fast_mb = peak_memory(fast)
+    print(f"{label}: stock peak {stock_mb:.0f} MB, fast peak {fast_mb:.0f} MB")
+
+
+# Cached per-column statistics
+# StatsCache keeps per-column summaries (count/sum/mean/M2/min/max, quantiles,
+# non-null counts) and pairwise cov/corr entries for a frame. Edits made
+# through the cache only invalidate the columns they touch: a single-cell
+# edit updates mean/var in O(1) (Welford replace), a new or dropped column
+# discards just its own entries, and corr()/cov() recompute only the rows of
+# the matrix whose column changed.
+class CachedAt:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __getitem__(self, key):
+        return self.cache.df.at[key]
+
+    def __setitem__(self, key, value):
+        self.cache.set_at(key[0], key[1], value)
+
+class StatsCache:
+    def __init__(self, df):
+        self.df = df
+        self.columns = {}                             # name -> summary dict
+        self.nonnull = {}                             # name -> non-null count (all dtypes)
+        self.pairs = {}                               # (a, b) -> (cov, corr)
+        self.at = CachedAt(self)
+
+    def numeric_columns(self):
+        return [c for c in self.df.columns
+                if pd.api.types.is_numeric_dtype(self.df[c]) and not pd.api.types.is_bool_dtype(self.df[c])]
+
+    def summary(self, name):
+        st = self.columns.get(name)
+        if st is None:
+            values = self.df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = values[~np.isnan(values)]
+            mean = valid.mean() if len(valid) else 0.0
+            st = {"count": len(valid), "sum": valid.sum(), "mean": mean, "m2": ((valid - mean) ** 2).sum(),
+                  "min": valid.min() if len(valid) else np.nan, "max": valid.max() if len(valid) else np.nan,
+                  "quantiles": None}
+            self.columns[name] = st
+        if st["min"] is None or st["max"] is None:    # extreme was overwritten, rescan this column only
+            values = self.df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            st["min"], st["max"] = np.nanmin(values), np.nanmax(values)
+        return st
+
+    def invalidate(self, name):
+        self.columns.pop(name, None)
+        self.nonnull.pop(name, None)
+        self.pairs = {k: v for k, v in self.pairs.items() if name not in k}
+
+    def set_at(self, row, col, value):
+        old = self.df.at[row, col]
+        self.df.at[row, col] = value
+        if col not in self.columns:
+            self.invalidate(col)
+            return
+        old, new = float(old), float(self.df.at[row, col])
+        st = self.columns[col]
+        if not np.isnan(old):                         # Welford remove ...
+            st["count"] -= 1
+            st["sum"] -= old
+            if st["count"] == 0:
+                st["mean"], st["m2"] = 0.0, 0.0
+            else:
+                d = old - st["mean"]
+                st["mean"] -= d / st["count"]
+                st["m2"] -= d * (old - st["mean"])
+            if old == st["min"]:
+                st["min"] = None
+            if old == st["max"]:
+                st["max"] = None
+        if not np.isnan(new):                         # ... then add
+            st["count"] += 1
+            st["sum"] += new
+            d = new - st["mean"]
+            st["mean"] += d / st["count"]
+            st["m2"] += d * (new - st["mean"])
+            if st["min"] is not None and not new >= st["min"]:
+                st["min"] = new
+            if st["max"] is not None and not new <= st["max"]:
+                st["max"] = new
+        if col in self.nonnull:
+            self.nonnull[col] += int(np.isnan(old)) - int(np.isnan(new))
+        st["quantiles"] = None
+        self.pairs = {k: v for k, v in self.pairs.items() if col not in k}
+
+    def __setitem__(self, name, values):
+        self.df[name] = values
+        self.invalidate(name)
+
+    def drop(self, columns):
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        self.df.drop(columns=columns, inplace=True)
+        for name in columns:
+            self.invalidate(name)
+
+    def count(self, name):
+        if name not in self.nonnull:
+            self.nonnull[name] = int(self.df[name].notna().sum())
+        return self.nonnull[name]
+
+    def sum(self, name):
+        return self.summary(name)["sum"]
+
+    def mean(self, name):
+        st = self.summary(name)
+        return st["mean"] if st["count"] else np.nan
+
+    def var(self, name):
+        st = self.summary(name)
+        return max(st["m2"], 0.0) / (st["count"] - 1) if st["count"] > 1 else np.nan
+
+    def std(self, name):
+        return np.sqrt(self.var(name))
+
+    def min(self, name):
+        return self.summary(name)["min"]
+
+    def max(self, name):
+        return self.summary(name)["max"]
+
+    def quantiles(self, name):
+        st = self.summary(name)
+        if st["quantiles"] is None:
+            values = self.df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = values[~np.isnan(values)]
+            st["quantiles"] = np.quantile(valid, [0.25, 0.5, 0.75]) if len(valid) else np.full(3, np.nan)
+        return st["quantiles"]
+
+    def describe(self):
+        rows = {}
+        for name in self.numeric_columns():
+            st = self.summary(name)
+            q25, q50, q75 = self.quantiles(name)
+            rows[name] = [st["count"], self.mean(name), self.std(name), st["min"], q25, q50, q75, st["max"]]
+        return pd.DataFrame(rows, index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"], dtype=float)
+
+    def info(self):
+        df = self.df
+        print(f"{type(df)}\n{df.index.__class__.__name__}: {len(df)} entries")
+        print(f"Data columns (total {df.shape[1]} columns):")
+        for i, name in enumerate(df.columns):
+            print(f" {i:<3} {name:<12} {self.count(name)} non-null  {df[name].dtype}")
+        counts = df.dtypes.astype(str).value_counts()
+        print("dtypes: " + ", ".join(f"{dtype}({n})" for dtype, n in sorted(counts.items())))
+        print(f"memory usage: {df.memory_usage(deep=False).sum() / 2**20:.1f} MB")
+
+    def _refresh_pairs(self, cols):
+        stale = [i for i, c in enumerate(cols) if (c, c) not in self.pairs]
+        if not stale:
+            return
+        X = self.df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        finite = ~np.isnan(X)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if finite.all():                          # one GEMM for all changed rows of the matrix
+                X = X - X.mean(axis=0)               # to_numpy may hand back a read-only view
+                cov = (X[:, stale].T @ X) / (len(X) - 1)
+                sd = np.sqrt((X * X).sum(axis=0) / (len(X) - 1))
+                corr = cov / (sd[stale, None] * sd)
+            else:                                     # pairwise-complete, one O(n*k) sweep per column
+                cov, corr = np.empty((len(stale), len(cols))), np.empty((len(stale), len(cols)))
+                for row, i in enumerate(stale):
+                    valid = finite & finite[:, [i]]
+                    cnt = valid.sum(axis=0)
+                    dx = np.where(valid, X[:, [i]] - np.where(valid, X[:, [i]], 0).sum(axis=0) / cnt, 0)
+                    dy = np.where(valid, X - np.where(valid, X, 0).sum(axis=0) / cnt, 0)
+                    cov[row] = (dx * dy).sum(axis=0) / (cnt - 1)
+                    corr[row] = (dx * dy).sum(axis=0) / np.sqrt((dx * dx).sum(axis=0) * (dy * dy).sum(axis=0))
+        for row, i in enumerate(stale):
+            for j, other in enumerate(cols):
+                cr = min(max(corr[row, j], -1.0), 1.0) if not np.isnan(corr[row, j]) else np.nan
+                self.pairs[cols[i], other] = self.pairs[other, cols[i]] = (cov[row, j], cr)
+
+    def cov(self):
+        cols = self.numeric_columns()
+        self._refresh_pairs(cols)
+        return pd.DataFrame([[self.pairs[a, b][0] for b in cols] for a in cols], index=cols, columns=cols)
+
+    def corr(self):
+        cols = self.numeric_columns()
+        self._refresh_pairs(cols)
+        return pd.DataFrame([[self.pairs[a, b][1] for b in cols] for a in cols], index=cols, columns=cols)
+
+rng = np.random.default_rng(0)
+wide = pd.DataFrame(rng.normal(size=(1_000_000, 20)), columns=[f"c{i}" for i in range(20)])
+wide["Age"] = rng.integers(18, 60, len(wide))
+stats = StatsCache(wide)
+
+def compare_stats(label):
+    start = time.perf_counter()
+    wide.describe(), wide.corr(), wide.cov(), wide.mean(), wide.std()
+    stock = time.perf_counter() - start
+    start = time.perf_counter()
+    stats.describe(), stats.corr(), stats.cov(), [stats.mean(c) for c in wide], [stats.std(c) for c in wide]
+    print(f"{label}: full rescan {stock:.2f}s, cached {time.perf_counter() - start:.3f}s")
+
+compare_stats("first call")
+stats.at[0, "Age"] = 26
+compare_stats("cell edit")
+stats["Grade"] = rng.integers(1, 6, len(wide))
+compare_stats("new column")
+stats.drop("c3")
+compare_stats("drop")
+stats.info()
+
+floats = pd.DataFrame(rng.normal(size=(100, 3)))              # all-float frame: to_numpy returns a view
+float_stats = StatsCache(floats)
+print(np.allclose(float_stats.corr(), floats.corr()), np.allclose(float_stats.cov(), floats.cov()))
+
+
+# Bulk export stage for CSV / NDJSON / XLSX and a memory-mappable binary format
+# Each column is formatted per distinct value (pd.factorize) and gathered back
+# with one array take, rows are joined straight from the column lists, and
+# chunks are encoded and compressed independently so they can run in a
+# process pool. Chunks are appended to a temporary file in submission order
+# and renamed into place at the end. gzip, bz2 and xz all accept concatenated streams, so each chunk is
+# compressed as its own member.
+COMPRESSORS = {".gz": gzip.compress, ".bz2": bz2.compress, ".xz": lzma.compress}
+
+def _format(series, fmt, na):
+    # every distinct value is formatted once and the rows gather from that table
+    codes, uniques = pd.factorize(series)
+    table = np.array([fmt(u) for u in uniques.tolist()] + [na], dtype=object)
+    return table[codes].tolist()                         # code -1 (NaN/NaT) picks na
+
+def date_formats(df):
+    # decided once per column over the whole frame so every chunk agrees
+    out = {}
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            dates = df[col].dropna()
+            out[col] = "%Y-%m-%d" if (dates == dates.dt.normalize()).all() else "%Y-%m-%d %H:%M:%S"
+    return out
+
+def _csv_cell(value):
+    text = str(value)
+    if any(ch in text for ch in ',"\n\r'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def _csv_text(series, date_fmt):
+    if date_fmt:
+        return _format(series, lambda ts: ts.strftime(date_fmt), "")
+    if pd.api.types.is_float_dtype(series):
+        return _format(series, repr, "")
+    return _format(series, _csv_cell, "")
+
+def encode_csv(chunk, start, formats):
+    rows = map(",".join, zip(*[_csv_text(chunk[col], formats.get(col)) for col in chunk.columns]))
+    return ("\n".join(rows) + "\n").encode()
+
+def _json_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return repr(value) if np.isfinite(value) else "null"
+    if isinstance(value, pd.Timestamp):                     # epoch ms, like DataFrame.to_json
+        return str(value.value // 1_000_000)
+    if isinstance(value, int):
+        return str(value)
+    return json.dumps(str(value))
+
+def encode_ndjson(chunk, start, formats):
+    cells = [_format(chunk[col], lambda v, key=json.dumps(str(col)) + ":": key + _json_value(v),
+                     json.dumps(str(col)) + ":null") for col in chunk.columns]
+    return ("".join("{" + ",".join(row) + "}\n" for row in zip(*cells))).encode()
+
+def _xlsx_cell(value):
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f"<c><v>{value!r}</v></c>" if np.isfinite(value) else "<c/>"
+    text = str(value).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def _xlsx_date_cell(style):
+    # Excel stores dates as days since 1899-12-30 plus a date number format
+    return lambda ts: f'<c s="{style}"><v>{ts.value / 86_400_000_000_000 + 25569!r}</v></c>'
+
+def encode_xlsx_rows(chunk, start, formats):
+    cells = []
+    for col in chunk.columns:
+        date_fmt = formats.get(col)
+        fmt = _xlsx_date_cell(2 if date_fmt == "%Y-%m-%d" else 1) if date_fmt else _xlsx_cell
+        cells.append(_format(chunk[col], fmt, "<c/>"))   # cells carry no ref, so gaps need a placeholder
+    rows = range(start + 2, start + 2 + len(chunk))            # row 1 is the header
+    return "".join(f'<row r="{r}">' + "".join(row) + "</row>" for r, row in zip(rows, zip(*cells))).encode()
+
+def _encode_compressed(encode, chunk, start, formats, compress):
+    data = encode(chunk, start, formats)
+    return compress(data) if compress else data
+
+def _ordered_chunks(df, encode, chunk_rows, workers, compress=None):
+    starts = range(0, len(df), chunk_rows)
+    formats = date_formats(df)
+    if not workers:
+        for start in starts:
+            yield _encode_compressed(encode, df.iloc[start:start + chunk_rows], start, formats, compress)
+        return
+    # at most 2 chunks per worker in flight; results are consumed in submission order
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for start in starts:
+            pending.append(pool.submit(_encode_compressed, encode, df.iloc[start:start + chunk_rows], start, formats, compress))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _export(path, header, chunks, compress):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        if header:
+            f.write(compress(header) if compress else header)
+        for data in chunks:
+            f.write(data)
+    os.replace(tmp, path)
+
+def export_csv(df, path, chunk_rows=200_000, workers=None):
+    compress = COMPRESSORS.get(os.path.splitext(path)[1])
+    header = ",".join(_csv_cell(c) for c in df.columns) + "\n"
+    _export(path, header.encode(), _ordered_chunks(df, encode_csv, chunk_rows, workers, compress), compress)
+
+def export_ndjson(df, path, chunk_rows=200_000, workers=None):
+    compress = COMPRESSORS.get(os.path.splitext(path)[1])
+    _export(path, b"", _ordered_chunks(df, encode_ndjson, chunk_rows, workers, compress), compress)
+
+XLSX_PARTS = {
+    "[Content_Types].xml": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>',
+    "_rels/.rels": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>',
+    "xl/workbook.xml": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>',
+    "xl/_rels/workbook.xml.rels": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '</Relationships>',
+    # cell style 1 = datetime, 2 = date (same display formats as DataFrame.to_excel)
+    "xl/styles.xml": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<numFmts count="2"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/>'
+        '<numFmt numFmtId="165" formatCode="yyyy-mm-dd"/></numFmts>'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles></styleSheet>',
+}
+
+def export_xlsx(df, path, chunk_rows=100_000, workers=None):
+    # streams the sheet XML into the zip instead of building a workbook object per cell
+    if len(df) + 1 > 1_048_576:
+        raise ValueError(f"sheet is too large: {len(df) + 1} rows, Excel allows at most 1048576")
+    tmp = f"{path}.tmp"
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for name, xml in XLSX_PARTS.items():
+            zf.writestr(name, xml)
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            sheet.write(encode_xlsx_rows(pd.DataFrame([list(map(str, df.columns))]), -1, {}))
+            for data in _ordered_chunks(df, encode_xlsx_rows, chunk_rows, workers):
+                sheet.write(data)
+            sheet.write(b"</sheetData></worksheet>")
+    os.replace(tmp, path)
+
+# Binary columnar file: a JSON header followed by one 64-byte aligned buffer
+# per column. String columns are stored as categorical codes plus their
+# dictionary, so every buffer maps back with np.memmap without decoding.
+COLUMNAR_MAGIC = b"PDCOLS01"
+
+def write_columnar(df, path):
+    columns, buffers, offset = [], [], 0
+    for name in df.columns:
+        s = df[name]
+        meta = {"name": str(name)}
+        data = s.to_numpy()
+        if data.dtype.kind in "biufM":                      # fixed-width buffers are stored as-is
+            meta["kind"] = "array"
+        else:
+            codes, uniques = pd.factorize(s)
+            data, meta["kind"], meta["categories"] = codes.astype(np.int32), "category", [str(u) for u in uniques]
+        meta["dtype"], meta["offset"], meta["nbytes"] = data.dtype.str, offset, data.nbytes
+        columns.append(meta)
+        buffers.append(data)
+        offset += -(-data.nbytes // 64) * 64
+    header = json.dumps({"rows": len(df), "columns": columns}).encode()
+    start = -(-(len(COLUMNAR_MAGIC) + 8 + len(header)) // 64) * 64
+    with open(path, "wb") as f:
+        f.write(COLUMNAR_MAGIC + len(header).to_bytes(8, "little") + header)
+        for meta, data in zip(columns, buffers):
+            f.seek(start + meta["offset"])
+            f.write(np.ascontiguousarray(data).tobytes())
+        f.truncate(start + offset)
+
+def read_columnar(path):
+    with open(path, "rb") as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"{path} is not a columnar file")
+        size = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(size))
+    start = -(-(len(COLUMNAR_MAGIC) + 8 + size) // 64) * 64
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    out = {}
+    for meta in header["columns"]:
+        data = raw[start + meta["offset"]:start + meta["offset"] + meta["nbytes"]].view(meta["dtype"])
+        if meta["kind"] == "category":
+            out[meta["name"]] = pd.Categorical.from_codes(data, meta["categories"])
+        else:
+            out[meta["name"]] = data
+    return pd.DataFrame(out, copy=False)
+
+rng = np.random.default_rng(1)
+export_df = pd.DataFrame({
+    "Name": rng.choice([f"user {i}" for i in range(1_000)], 500_000),
+    "Age": rng.integers(18, 60, 500_000),
+    "Score": rng.normal(70, 15, 500_000).round(2),
+    "Passed": rng.random(500_000) > 0.3,
+    "Date": pd.Timestamp("2021-01-01") + pd.to_timedelta(rng.integers(0, 1_000, 500_000), unit="D"),
+})
+
+export_dir = tempfile.mkdtemp()                              # benchmark files are removed at the end
+
+def throughput(label, write, name):
+    path = os.path.join(export_dir, name)
+    start = time.perf_counter()
+    write(path)
+    seconds = time.perf_counter() - start
+    print(f"{label:<24} {seconds:6.2f}s {os.path.getsize(path) / 2**20 / seconds:8.1f} MB/s")
+
+throughput("to_csv", lambda p: export_df.to_csv(p, index=False), "export_stock.csv")
+throughput("export_csv", lambda p: export_csv(export_df, p), "export_fast.csv")
+throughput("to_csv gzip", lambda p: export_df.to_csv(p, index=False), "export_stock.csv.gz")
+throughput("export_csv gzip", lambda p: export_csv(export_df, p), "export_fast.csv.gz")
+throughput("to_json lines", lambda p: export_df.to_json(p, orient="records", lines=True), "export_stock.json")
+throughput("export_ndjson", lambda p: export_ndjson(export_df, p), "export_fast.json")
+try:
+    throughput("to_excel", lambda p: export_df.to_excel(p, index=False), "export_stock.xlsx")
+except ImportError:
+    print("to_excel                 skipped (no Excel writer engine installed)")
+throughput("export_xlsx", lambda p: export_xlsx(export_df, p), "export_fast.xlsx")
+throughput("to_pickle", lambda p: export_df.to_pickle(p), "export_stock.pkl")
+throughput("write_columnar", lambda p: write_columnar(export_df, p), "export_fast.cols")
+start = time.perf_counter()
+mapped = read_columnar(os.path.join(export_dir, "export_fast.cols"))   # workers=N on the export_* calls runs chunks in a pool
+print(f"read_columnar            {time.perf_counter() - start:6.2f}s (memory-mapped)")
+del mapped
+shutil.rmtree(export_dir)
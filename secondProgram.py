@@ -1,4 +1,12 @@
 import json
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+import numpy as np
 Student_data = {"Name": "Ujjwal", "age": 20, "marks": "90",}
 
 # convert dictionary into json string
@@ -8,4 +16,116 @@ print(type(data))
 
 # convert json string into dictionary
 data = json.loads(data)
-print(data["age"])
\ No newline at end of file
+print(data["age"])
+
+# Streaming NDJSON (one JSON record per line)
+# Records are written in batches to a buffered binary file and read back
+# through mmap. Each batch of lines is decoded with a single json.loads call
+# and goes straight into typed NumPy columns: schema fields (e.g. marks ->
+# int) are filled with np.fromiter and must be present in every record, other
+# fields stay object arrays with None where a record lacks them. Shards
+# of the file can be decoded in parallel by worker processes.
+SCHEMA_DTYPES = {int: np.int64, float: np.float64, bool: np.bool_, str: object}
+
+def write_ndjson(path, records, batch_size=10_000):
+    with open(path, "wb", buffering=1 << 20) as f:
+        batch = []
+        for record in records:
+            batch.append(json.dumps(record, separators=(",", ":")))
+            if len(batch) == batch_size:
+                f.write(("\n".join(batch) + "\n").encode())
+                batch = []
+        if batch:
+            f.write(("\n".join(batch) + "\n").encode())
+
+def read_ndjson(path, batch_bytes=1 << 20, start=0, stop=None):
+    # yields lists of dicts; start/stop are byte offsets on line boundaries
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        stop = len(mm) if stop is None else stop
+        pos = start
+        while pos < stop:
+            end = mm.rfind(b"\n", pos, min(pos + batch_bytes, stop)) + 1
+            if end <= pos:                                    # line longer than batch_bytes
+                end = mm.find(b"\n", pos, stop) + 1 or stop
+            lines = filter(None, map(bytes.strip, mm[pos:end].split(b"\n")))   # skip blank lines
+            chunk = b",".join(lines)
+            if chunk:
+                yield json.loads(b"[" + chunk + b"]")           # one decode per batch
+            pos = end
+
+def shard_offsets(path, shards):
+    # split the file into byte ranges that start on line boundaries
+    size = os.path.getsize(path)
+    offsets = [0]
+    with open(path, "rb") as f:
+        for i in range(1, shards):
+            f.seek(max(size * i // shards, offsets[-1]))
+            f.readline()
+            offsets.append(min(f.tell(), size))
+    offsets.append(size)
+    return list(zip(offsets[:-1], offsets[1:]))
+
+def _typed(batch, field, dtype):
+    try:
+        return np.fromiter((record.get(field) for record in batch), dtype=dtype, count=len(batch))
+    except TypeError:
+        if any(record.get(field) is None for record in batch):
+            raise ValueError(f"field {field!r} is typed {dtype} but some records have no value for it; "
+                             f"use str in the schema to keep missing values as None") from None
+        raise
+
+def _concat(parts, dtypes):
+    # parts are (rows, columns) pairs; a field a part never saw reads as None there
+    return {field: np.concatenate([columns[field] if field in columns else np.full(rows, None, dtype=object)
+                                   for rows, columns in parts]) if parts else np.empty(0, dtype)
+            for field, dtype in dtypes.items()}
+
+def to_columns(batches, schema=None):
+    # fields are the schema's plus every field seen in any record
+    dtypes = {field: np.dtype(SCHEMA_DTYPES.get(kind, kind)) for field, kind in (schema or {}).items()}
+    parts = []
+    for batch in batches:
+        for field in dict.fromkeys(chain.from_iterable(batch)):         # first-seen order
+            dtypes.setdefault(field, np.dtype(object))
+        parts.append((len(batch), {field: _typed(batch, field, dtype) for field, dtype in dtypes.items()}))
+    return _concat(parts, dtypes)
+
+def _decode_shard(args):
+    path, start, stop, schema = args
+    return to_columns(read_ndjson(path, start=start, stop=stop), schema)
+
+def read_columns(path, schema=None, workers=None, as_frame=False):
+    if workers:
+        jobs = [(path, a, b, schema) for a, b in shard_offsets(path, workers)]
+        with ProcessPoolExecutor(workers) as pool:
+            # shards come back in file order and may each have seen different fields
+            parts = [(len(next(iter(part.values()))), part) for part in pool.map(_decode_shard, jobs) if part]
+        dtypes = {}
+        for _, part in parts:
+            for field, column in part.items():
+                dtypes.setdefault(field, column.dtype)
+        columns = _concat(parts, dtypes)
+    else:
+        columns = to_columns(read_ndjson(path), schema)
+    if as_frame:
+        import pandas as pd          # optional dependency
+        return pd.DataFrame(columns).infer_objects()
+    return columns
+
+records = ({"Name": f"Student{i}", "age": 18 + i % 10, "marks": str(i % 100)} for i in range(200_000))
+ndjson_dir = tempfile.mkdtemp()
+ndjson_path = os.path.join(ndjson_dir, "students.ndjson")
+start = time.perf_counter()
+write_ndjson(ndjson_path, records)
+elapsed = time.perf_counter() - start
+mb = os.path.getsize(ndjson_path) / 2**20
+print(f"write: {200_000 / elapsed:,.0f} records/s, {mb / elapsed:.1f} MB/s")
+
+start = time.perf_counter()
+columns = read_columns(ndjson_path, schema={"marks": int})   # workers=N decodes shards in parallel
+elapsed = time.perf_counter() - start
+print(f"read: {len(columns['marks']) / elapsed:,.0f} records/s, {mb / elapsed:.1f} MB/s")
+print(columns["marks"][:5])
+shutil.rmtree(ndjson_dir)
@@ -1,4 +1,11 @@
 # Python Set Methods Demonstration
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
 
 a = {1, 2, 3}
 b = {3, 4, 5}
@@ -73,3 +80,255 @@ temp = {1, 2}
 temp.update([3, 4], {5})
 print("update:", temp)
 
+
+# Compressed bitmap set for large sets of integer IDs (roaring-style)
+# Values (0 <= v < 2**32) are grouped by their high 16 bits. Each group is a
+# container: a sorted uint16 array when it holds <= 4096 values, otherwise a
+# 65536-bit bitmap stored as 1024 uint64 words. Set algebra runs on whole
+# 64-bit words at a time. Containers are never modified in place, so copies
+# can share them and sets loaded from a memory-mapped file stay read-only.
+ARRAY_MAX = 4096
+
+def _to_bitmap(c):
+    if c.dtype == np.uint64:
+        return c
+    bits = np.zeros(65536, dtype=bool)
+    bits[c] = True
+    return np.packbits(bits, bitorder="little").view(np.uint64)
+
+def _to_array(c):
+    if c.dtype == np.uint16:
+        return c
+    return np.flatnonzero(np.unpackbits(c.view(np.uint8), bitorder="little")).astype(np.uint16)
+
+def _count(c):
+    return len(c) if c.dtype == np.uint16 else int(np.unpackbits(c.view(np.uint8)).sum())
+
+def _normalize(bitmap):
+    n = _count(bitmap)
+    if n == 0:
+        return None
+    return _to_array(bitmap) if n <= ARRAY_MAX else bitmap
+
+def _from_array(array):
+    if len(array) == 0:
+        return None
+    return array if len(array) <= ARRAY_MAX else _to_bitmap(array)
+
+class IntBitSet:
+    def __init__(self, values=()):
+        self.containers = {}                 # high 16 bits -> container
+        values = np.unique(np.fromiter(values, dtype=np.int64) if not isinstance(values, np.ndarray)
+                           else values.astype(np.int64))
+        if len(values):
+            IntBitSet._check(values[0]), IntBitSet._check(values[-1])
+        highs, starts = np.unique(values >> 16, return_index=True)
+        for high, low in zip(highs.tolist(), np.split((values & 0xFFFF).astype(np.uint16), starts[1:])):
+            self.containers[high] = low if len(low) <= ARRAY_MAX else _to_bitmap(low)
+
+    @staticmethod
+    def _check(value):
+        if not 0 <= value < 2**32:
+            raise ValueError("IntBitSet values must be in range(2**32)")
+
+    @staticmethod
+    def _coerce(other):
+        return other if isinstance(other, IntBitSet) else IntBitSet(other)
+
+    def _combine(self, other, op, array_op, keep_left, keep_right):
+        out = IntBitSet()
+        for key in self.containers.keys() | other.containers.keys():
+            a, b = self.containers.get(key), other.containers.get(key)
+            if a is None:
+                c = b if keep_right else None
+            elif b is None:
+                c = a if keep_left else None
+            elif a.dtype == b.dtype == np.uint16:  # two small sorted arrays, no bitmaps needed
+                c = _from_array(array_op(a, b))
+            else:
+                c = _normalize(op(_to_bitmap(a), _to_bitmap(b)))   # word-parallel
+            if c is not None:
+                out.containers[key] = c
+        return out
+
+    def __len__(self):
+        return sum(_count(c) for c in self.containers.values())
+
+    def __contains__(self, value):
+        c = self.containers.get(value >> 16)
+        if c is None:
+            return False
+        low = value & 0xFFFF
+        if c.dtype == np.uint16:
+            i = np.searchsorted(c, low)
+            return bool(i < len(c) and c[i] == low)
+        return bool((int(c[low >> 6]) >> (low & 63)) & 1)
+
+    def __iter__(self):
+        for key in sorted(self.containers):
+            yield from ((key << 16) | _to_array(self.containers[key]).astype(np.int64)).tolist()
+
+    def __eq__(self, other):
+        if not isinstance(other, IntBitSet):
+            return NotImplemented
+        return (self.containers.keys() == other.containers.keys() and
+                all(np.array_equal(_to_array(c), _to_array(other.containers[k]))
+                    for k, c in self.containers.items()))
+
+    def __repr__(self):
+        return f"IntBitSet({set(self) if len(self) <= 20 else f'<{len(self)} values>'})"
+
+    # the 17 set methods
+    def add(self, value):
+        self._check(value)
+        key, low = value >> 16, value & 0xFFFF
+        c = self.containers.get(key)
+        if c is None:
+            self.containers[key] = np.array([low], dtype=np.uint16)
+        elif c.dtype == np.uint16:
+            i = np.searchsorted(c, low)
+            if i == len(c) or c[i] != low:
+                c = np.insert(c, i, low)
+                self.containers[key] = c if len(c) <= ARRAY_MAX else _to_bitmap(c)
+        else:
+            c = c.copy()
+            c[low >> 6] |= np.uint64(1 << (low & 63))
+            self.containers[key] = c
+
+    def clear(self):
+        self.containers = {}
+
+    def copy(self):
+        out = IntBitSet()
+        out.containers = dict(self.containers)
+        return out
+
+    def difference(self, *others):
+        out = self
+        for other in others:
+            out = out._combine(self._coerce(other), lambda a, b: a & ~b,
+                               lambda a, b: np.setdiff1d(a, b, assume_unique=True), True, False)
+        return out.copy()
+
+    def difference_update(self, *others):
+        self.containers = self.difference(*others).containers
+
+    def discard(self, value):
+        self._check(value)
+        key, low = value >> 16, value & 0xFFFF
+        c = self.containers.get(key)
+        if c is None or value not in self:
+            return
+        if c.dtype == np.uint16:
+            c = c[c != low]
+        else:
+            c = c.copy()
+            c[low >> 6] &= ~np.uint64(1 << (low & 63))
+            c = _normalize(c)
+        if c is None or len(c) == 0:
+            del self.containers[key]
+        else:
+            self.containers[key] = c
+
+    def intersection(self, *others):
+        out = self
+        for other in others:
+            out = out._combine(self._coerce(other), np.bitwise_and,
+                               lambda a, b: np.intersect1d(a, b, assume_unique=True), False, False)
+        return out.copy()
+
+    def intersection_update(self, *others):
+        self.containers = self.intersection(*others).containers
+
+    def isdisjoint(self, other):
+        return len(self.intersection(other)) == 0
+
+    def issubset(self, other):
+        return len(self.difference(other)) == 0
+
+    def issuperset(self, other):
+        return self._coerce(other).issubset(self)
+
+    def pop(self):
+        if not self.containers:
+            raise KeyError("pop from an empty set")
+        key = min(self.containers)
+        value = (key << 16) | int(_to_array(self.containers[key])[0])
+        self.discard(value)
+        return value
+
+    def remove(self, value):
+        self._check(value)
+        if value not in self:
+            raise KeyError(value)
+        self.discard(value)
+
+    def symmetric_difference(self, other):
+        return self._combine(self._coerce(other), np.bitwise_xor,
+                             lambda a, b: np.setxor1d(a, b, assume_unique=True), True, True)
+
+    def symmetric_difference_update(self, other):
+        self.containers = self.symmetric_difference(other).containers
+
+    def union(self, *others):
+        out = self
+        for other in others:
+            out = out._combine(self._coerce(other), np.bitwise_or, np.union1d, True, True)
+        return out.copy()
+
+    def update(self, *others):
+        self.containers = self.union(*others).containers
+
+    # serialization: [count][count x (key, is_bitmap, offset, length)][8-byte aligned data]
+    def to_bytes(self):
+        keys = sorted(self.containers)
+        header = np.zeros((len(keys), 4), dtype=np.uint64)
+        blobs, offset = [], 8 + header.nbytes
+        for i, key in enumerate(keys):
+            c = self.containers[key]
+            raw = c.tobytes() + b"\0" * (-c.nbytes % 8)
+            header[i] = key, c.dtype == np.uint64, offset, len(c)
+            blobs.append(raw)
+            offset += len(raw)
+        return np.uint64(len(keys)).tobytes() + header.tobytes() + b"".join(blobs)
+
+    @classmethod
+    def from_buffer(cls, buf):
+        n = int(np.frombuffer(buf, dtype=np.uint64, count=1)[0])
+        header = np.frombuffer(buf, dtype=np.uint64, count=4 * n, offset=8).reshape(n, 4)
+        out = cls()
+        for key, is_bitmap, offset, length in header.tolist():
+            dtype = np.uint64 if is_bitmap else np.uint16
+            out.containers[key] = np.frombuffer(buf, dtype=dtype, count=length, offset=offset)  # zero-copy
+        return out
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_buffer(np.memmap(path, dtype=np.uint8, mode="r"))
+
+ba, bb = IntBitSet(a), IntBitSet(b)
+print("IntBitSet union:", ba.union(bb))
+print("IntBitSet intersection:", ba.intersection(bb))
+print("IntBitSet difference:", ba.difference(bb))
+print("IntBitSet symmetric_difference:", ba.symmetric_difference(bb))
+print("IntBitSet issubset:", IntBitSet({1, 2}).issubset(ba))
+bitset_dir = tempfile.mkdtemp()
+ba.save(os.path.join(bitset_dir, "ids.bitset"))
+print("IntBitSet loaded from memmap:", IntBitSet.load(os.path.join(bitset_dir, "ids.bitset")) == ba)
+shutil.rmtree(bitset_dir)
+
+# Large ID sets: memory and union time against built-in sets
+ids1 = np.random.randint(0, 50_000_000, 5_000_000)
+ids2 = np.random.randint(0, 50_000_000, 5_000_000)
+big1, big2 = IntBitSet(ids1), IntBitSet(ids2)
+start = time.perf_counter()
+big_union = big1.union(big2)
+print(f"IntBitSet union: {time.perf_counter() - start:.3f}s, {len(big1.to_bytes()) / len(big1):.1f} bytes/value")
+py1, py2 = set(ids1.tolist()), set(ids2.tolist())
+start = time.perf_counter()
+py_union = py1 | py2
+print(f"set union: {time.perf_counter() - start:.3f}s, {sys.getsizeof(py1) / len(py1) + 28:.1f} bytes/value")
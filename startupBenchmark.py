@@ -0,0 +1,82 @@
+# Startup benchmark for the example scripts
+# Runs only the import statements of each script (including lazy_import
+# lines) in a fresh interpreter and records cold and warm import time and
+# the peak RSS after import. Exits with status 1 if a budget is exceeded.
+import ast
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+# seconds of import time and MB of RSS allowed per script
+DEFAULT_BUDGET = {"warm_s": 1.0, "rss_mb": 200}
+BUDGETS = {
+    "matplotlibProgram.py": {"warm_s": 2.0, "rss_mb": 250},
+    "pandasProgram.py": {"warm_s": 2.0, "rss_mb": 250},
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+exec(compile(sys.stdin.read(), "<imports>", "exec"), {})
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+except ImportError:
+    rss_mb = float("nan")
+print(json.dumps({"seconds": elapsed, "rss_mb": rss_mb}))
+"""
+
+
+def import_header(path):
+    # top-level imports plus `name = lazy_import(...)` assignments
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    keep = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            keep.append(node)
+        elif (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)
+              and getattr(node.value.func, "id", None) == "lazy_import"):
+            keep.append(node)
+    return "\n".join(ast.unparse(node) for node in keep)
+
+
+def measure(code):
+    result = subprocess.run([sys.executable, "-c", PROBE], input=code, capture_output=True,
+                            text=True, cwd=HERE, check=True)
+    return json.loads(result.stdout)
+
+
+def benchmark(path, runs=5):
+    code = import_header(path)
+    cold = measure(code)            # first run also compiles .pyc files
+    warm = [measure(code) for _ in range(runs)]
+    return {
+        "cold_s": cold["seconds"],
+        "warm_s": statistics.median(r["seconds"] for r in warm),
+        "rss_mb": max(r["rss_mb"] for r in warm),
+    }
+
+
+if __name__ == "__main__":
+    failed = False
+    for path in sorted(HERE.glob("*.py")):
+        if path.name == Path(__file__).name:
+            continue
+        try:
+            stats = benchmark(path)
+        except subprocess.CalledProcessError as err:
+            print(f"{path.name:24} import failed: {err.stderr.strip().splitlines()[-1]}")
+            failed = True
+            continue
+        budget = BUDGETS.get(path.name, DEFAULT_BUDGET)
+        over = [key for key, limit in budget.items() if stats[key] > limit]
+        failed = failed or bool(over)
+        print(f"{path.name:24} cold {stats['cold_s']:.3f}s  warm {stats['warm_s']:.3f}s  "
+              f"rss {stats['rss_mb']:.0f} MB  {'OVER BUDGET: ' + ', '.join(over) if over else 'ok'}")
+    sys.exit(1 if failed else 0)
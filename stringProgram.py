@@ -1,3 +1,14 @@
+import functools
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
 s = "hello world"
 s2 = "Python123"
 s3 = "   spaced   "
@@ -50,4 +61,231 @@ print("strip():", s3.strip())
 print("swapcase():", "Hello World".swapcase())
 print("title():", s.title())
 print("upper():", s5.upper())
-print("zfill():", "42".zfill(5))
\ No newline at end of file
+print("zfill():", "42".zfill(5))
+
+# Batch string kernels: apply a str method to a whole column at once
+# The column is a NumPy string array. For ASCII columns, case mapping and
+# 1:1 translate tables run as lookup tables on the raw code points, and
+# strip/zfill/partition/replace/title and the is* predicates use NumPy's
+# vectorized np.strings functions. Non-ASCII columns fall back to the exact
+# scalar str method per element. Lists in give lists out.
+ASCII_CHARS = "".join(map(chr, range(128)))
+CASE_TABLES = {m: np.array([ord(c) for c in getattr(ASCII_CHARS, m)()], dtype=np.uint32)
+               for m in ("upper", "lower", "casefold", "swapcase")}
+VECTORIZED = {"strip", "lstrip", "rstrip", "zfill", "partition", "rpartition", "replace", "title",
+              "isalnum", "isalpha", "isdecimal", "isdigit", "isnumeric", "isspace", "islower",
+              "isupper", "istitle"}
+
+@functools.lru_cache(maxsize=64)
+def translate_table(items):
+    # code point lookup table for a 1:1 ASCII str.maketrans dict, else None
+    table = np.arange(128, dtype=np.uint32)
+    for key, value in items:
+        if isinstance(value, str) and len(value) == 1:
+            value = ord(value)
+        if not isinstance(value, int) or not 0 < key < 128 or not 0 < value < 128:
+            return None
+        table[key] = value
+    return table
+
+def _codes(arr):
+    return np.ascontiguousarray(arr).view(np.uint32).reshape(len(arr), arr.dtype.itemsize // 4)
+
+def _scalar(method, arr, args):
+    results = [getattr(s, method)(*args) for s in arr.tolist()]
+    if method in ("partition", "rpartition"):
+        return tuple(np.array(part, dtype=str) for part in zip(*results)) if results else (arr,) * 3
+    return np.array(results, dtype=bool if method.startswith("is") else str)
+
+def _chunk_kernel(method, arr, args):
+    codes = _codes(arr)
+    if len(arr) == 0 or codes.max(initial=0) >= 128:
+        return _scalar(method, arr, args)               # exact Unicode semantics
+    if method in CASE_TABLES:
+        return CASE_TABLES[method][codes].view(arr.dtype).ravel()
+    if method == "translate":
+        table = translate_table(tuple(sorted(args[0].items())))
+        return _scalar(method, arr, args) if table is None else table[codes].view(arr.dtype).ravel()
+    if method in VECTORIZED:
+        return getattr(np.strings, method)(arr, *args)
+    return _scalar(method, arr, args)
+
+def batch(method, column, *args, workers=None, chunk_size=1_000_000):
+    if isinstance(column, np.ndarray) and column.dtype.kind != "U":
+        # object arrays (e.g. a pandas column's .to_numpy()) go through the list path, object out
+        out = batch(method, column.tolist(), *args, workers=workers, chunk_size=chunk_size)
+        if method in ("partition", "rpartition"):
+            if not out:
+                return (column[:0],) * 3
+            return tuple(np.array([r[k] if isinstance(r, tuple) else r for r in out], dtype=object)
+                         for k in range(3))
+        return np.array(out, dtype=object)
+    if not isinstance(column, np.ndarray):
+        column = list(column)
+        strings = [i for i, s in enumerate(column) if isinstance(s, str)]
+        if len(strings) < len(column):                      # None/NaN pass through, like Series.str
+            out = list(column)
+            done = batch(method, [column[i] for i in strings], *args, workers=workers, chunk_size=chunk_size)
+            for i, result in zip(strings, done):
+                out[i] = result
+            return out
+        if any("\0" in s for s in column):                  # NumPy drops trailing "\0"
+            return [getattr(s, method)(*args) for s in column]
+        out = batch(method, np.array(column, dtype=str), *args, workers=workers, chunk_size=chunk_size)
+        if isinstance(out, tuple):
+            return list(zip(*(part.tolist() for part in out)))
+        return out.tolist()
+    chunks = np.array_split(column, max(1, -(-len(column) // chunk_size)))
+    if workers and len(chunks) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(_chunk_kernel, [method]*len(chunks), chunks, [args]*len(chunks)))
+    else:
+        parts = [_chunk_kernel(method, chunk, args) for chunk in chunks]
+    if isinstance(parts[0], tuple):
+        return tuple(np.concatenate(p) for p in zip(*parts))
+    return np.concatenate(parts)
+
+# Differential check: every kernel must match the scalar method exactly
+column = [s, s2, s3, s4, s5, s6, "42", "-7", "+0x", "Hello World", "a\tb", "", "ß", "Ⅻ", "ΑΣ ς", "x\0y"]
+checks = [("upper",), ("lower",), ("casefold",), ("swapcase",), ("title",), ("strip",), ("lstrip",),
+          ("rstrip",), ("strip", " d"), ("replace", "l", "L"), ("replace", "o", ""), ("zfill", 5),
+          ("translate", str.maketrans({"h": "H", "e": "E"})), ("translate", str.maketrans({"h": None})),
+          ("partition", " "), ("rpartition", "l"), ("isalnum",), ("isalpha",), ("isdecimal",),
+          ("isdigit",), ("islower",), ("isnumeric",), ("isspace",), ("istitle",), ("isupper",)]
+ascii_column = [c for c in column if c.isascii() and "\0" not in c]
+
+def as_list(out):
+    return list(zip(*(part.tolist() for part in out))) if isinstance(out, tuple) else out.tolist()
+
+mismatches = [(name, *args) for name, *args in checks
+              for col in (column, ascii_column)
+              if batch(name, col, *args) != [getattr(c, name)(*args) for c in col]
+              or as_list(batch(name, np.array(col, dtype=object), *args)) != [getattr(c, name)(*args) for c in col]]
+missing = np.array(["a b", None, np.nan, "C"], dtype=object)              # e.g. a pandas column with gaps
+mismatches += [(name, *args) for name, *args in checks
+               if as_list(batch(name, missing, *args))
+               != [getattr(c, name)(*args) if isinstance(c, str) else (c,) * 3 if "partition" in name else c
+                   for c in missing]]
+print("batch kernels match scalar methods:", not mismatches, mismatches or "")
+
+big = [f"  item-{i} Hello World  " for i in range(1_000_000)]
+big_array = np.array(big)
+for name, args in [("upper", ()), ("strip", ()), ("isdigit", ()), ("replace", ("Hello", "Hi"))]:
+    start = time.perf_counter()
+    [getattr(x, name)(*args) for x in big]
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    batch(name, big_array, *args)
+    print(f"{name}: loop {loop:.3f}s, batch {time.perf_counter() - start:.3f}s")
+
+# Multi-pattern search (Aho-Corasick) instead of one find/count pass per keyword
+# All patterns are compiled into one automaton over bytes, so the text is
+# scanned once and every (overlapping) occurrence of every pattern is
+# reported. The automaton state carries over between chunks of a memory-
+# mapped file, and a file can be split across worker processes: each worker
+# starts len(longest pattern) - 1 bytes early and keeps only matches that
+# end inside its own range. Positions are byte offsets of the UTF-8 text.
+class MultiPattern:
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        encoded = [p.encode() for p in self.patterns]
+        if not all(encoded):
+            raise ValueError("patterns must be non-empty")
+        self.lengths = [len(p) for p in encoded]
+        goto, out = [{}], [[]]
+        for pid, p in enumerate(encoded):                 # build the trie
+            state = 0
+            for b in p:
+                if b not in goto[state]:
+                    goto[state][b] = len(goto)
+                    goto.append({})
+                    out.append([])
+                state = goto[state][b]
+            out[state].append(pid)
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)                         # full transition table
+        delta[0] = [goto[0].get(b, 0) for b in range(256)]
+        queue = deque(goto[0].values())
+        while queue:                                       # breadth first: fail links first
+            state = queue.popleft()
+            out[state] = out[state] + out[fail[state]]
+            row = list(delta[fail[state]])
+            for b, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]][b]
+                row[b] = nxt
+                queue.append(nxt)
+            delta[state] = row
+        self.delta, self.out = delta, out
+
+    def scan(self, data, state=0, base=0, min_end=0, counts=None, positions=None):
+        # feed bytes; returns the automaton state so the next chunk can continue
+        delta, out, lengths = self.delta, self.out, self.lengths
+        for i, b in enumerate(data):
+            state = delta[state][b]
+            if out[state] and base + i + 1 > min_end:
+                for pid in out[state]:
+                    counts[pid] += 1
+                    if positions is not None:
+                        positions[pid].append(base + i + 1 - lengths[pid])
+        return state
+
+    def search(self, text, positions=True):
+        counts, found = [0] * len(self.patterns), [[] for _ in self.patterns] if positions else None
+        self.scan(text.encode(), counts=counts, positions=found)
+        return self._result(counts, found)
+
+    def search_file(self, path, chunk_size=1 << 24, workers=None, positions=True):
+        size = os.path.getsize(path)
+        if workers and size:
+            bounds = [size * i // workers for i in range(workers + 1)]
+            with ProcessPoolExecutor(workers, initializer=_set_matcher, initargs=(self,)) as pool:
+                parts = list(pool.map(_search_range, [path] * workers, bounds[:-1], bounds[1:],
+                                      [chunk_size] * workers, [positions] * workers))
+            counts = [sum(c) for c in zip(*(p[0] for p in parts))]
+            found = [sum((p[1][i] for p in parts), []) for i in range(len(self.patterns))] if positions else None
+        else:
+            counts, found = self._scan_range(path, 0, size, chunk_size, positions)
+        return self._result(counts, found)
+
+    def _scan_range(self, path, start, stop, chunk_size, positions):
+        counts, found = [0] * len(self.patterns), [[] for _ in self.patterns] if positions else None
+        if stop <= start:
+            return counts, found
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            state, pos = 0, max(0, start - max(self.lengths) + 1)   # overlap with the previous range
+            while pos < stop:
+                end = min(pos + chunk_size, stop)
+                state = self.scan(mm[pos:end], state, pos, start, counts, found)
+                pos = end
+        return counts, found
+
+    def _result(self, counts, found):
+        return {p: (counts[i], found[i] if found is not None else None) for i, p in enumerate(self.patterns)}
+
+_matcher = None
+
+def _set_matcher(matcher):
+    global _matcher
+    _matcher = matcher
+
+def _search_range(path, start, stop, chunk_size, positions):
+    return _matcher._scan_range(path, start, stop, chunk_size, positions)
+
+matcher = MultiPattern(["world", "l", "lo", "hello", "o w"])
+print("MultiPattern:", matcher.search(s))   # (count, start positions) per pattern, overlaps included
+
+# One pass for many keywords vs one str.count pass per keyword
+keywords = [f"user{i:04d}" for i in range(1000)]
+lines = [f"2024-01-01 GET /home user{i % 5000:04d} status=200\n" for i in range(100_000)]
+log_dir = tempfile.mkdtemp()
+log_path = os.path.join(log_dir, "app.log")
+with open(log_path, "w") as f:
+    f.writelines(lines)
+text = "".join(lines)
+start = time.perf_counter()
+slow = [text.count(k) for k in keywords]
+print(f"str.count x{len(keywords)}: {time.perf_counter() - start:.2f}s")
+start = time.perf_counter()
+fast = MultiPattern(keywords).search_file(log_path, positions=False)   # workers=N splits the file
+print(f"MultiPattern one pass: {time.perf_counter() - start:.2f}s")
+shutil.rmtree(log_dir)